@@ -88,6 +88,7 @@ class UserProfile(models.Model):
         blank=True,
         null=True,
     )
+    profile_picture_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     @property
     def full_name(self):
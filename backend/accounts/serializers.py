@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from hotels.images import rendition_urls
 
 User = get_user_model()
 
@@ -22,9 +23,13 @@ class UserSerializer(serializers.ModelSerializer):
 
             # Get profile picture URL properly
             profile_picture_url = None
+            profile_picture_renditions = {}
             if obj.profile.profile_picture:
                 try:
                     profile_picture_url = obj.profile.profile_picture.url
+                    profile_picture_renditions = rendition_urls(
+                        obj.profile.profile_picture, obj.profile.profile_picture_renditions
+                    )
                 except Exception:
                     # If URL generation fails (e.g., file doesn't exist), return None
                     profile_picture_url = None
@@ -34,7 +39,8 @@ class UserSerializer(serializers.ModelSerializer):
                 'phone_number': obj.profile.phone_number or '',
                 'date_of_birth': obj.profile.date_of_birth or None,
                 'bio': obj.profile.bio or '',
-                'profile_picture': profile_picture_url
+                'profile_picture': profile_picture_url,
+                'profile_picture_renditions': profile_picture_renditions
             }
         except Exception as e:
             # Log the error for debugging
@@ -47,7 +53,8 @@ class UserSerializer(serializers.ModelSerializer):
                 'phone_number': '',
                 'date_of_birth': None,
                 'bio': '',
-                'profile_picture': None
+                'profile_picture': None,
+                'profile_picture_renditions': {}
             }
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -1,6 +1,7 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import AppUser, UserProfile
+from hotels.tasks import schedule_renditions
 
 
 @receiver(post_save, sender=AppUser)
@@ -15,3 +16,11 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
         # Log the error but don't prevent user creation
         print(f"Error creating user profile: {str(e)}")
         pass
+
+
+@receiver(post_save, sender=UserProfile)
+def queue_profile_picture_renditions(sender, instance, **kwargs):
+    """
+    Generates resized renditions of a new profile picture in a worker
+    """
+    schedule_renditions(instance)
@@ -0,0 +1,40 @@
+import logging
+from smtplib import SMTPException
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from .utils import send_welcome_email
+
+logger = logging.getLogger('accounts')
+
+
+@shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+)
+def send_welcome_email_task(user_id):
+    """
+    Deliver the welcome email from a worker, retrying with exponential
+    backoff while the mail relay is unavailable.
+    """
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None:
+        return False
+    return send_welcome_email(user, fail_silently=False)
+
+
+def schedule_welcome_email(user):
+    """
+    Enqueue the welcome email once the current transaction commits, so the
+    worker never sees an uncommitted user and SMTP never holds it open.
+    """
+    def enqueue():
+        try:
+            send_welcome_email_task.delay(user.pk)
+        except Exception as e:
+            logger.error(f"Failed to enqueue welcome email for {user.email}: {str(e)}")
+
+    transaction.on_commit(enqueue)
@@ -1,9 +1,14 @@
+from smtplib import SMTPException
+from unittest import mock
+from django.core import mail
 from django.test import TestCase, Client
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from .models import UserProfile, UserType
+from .tasks import send_welcome_email_task
+from hotels.benchmark import ENDPOINTS, seed_dataset, measure_endpoint
 
 User = get_user_model()
 
@@ -154,3 +159,71 @@ class UserProfileAPITests(APITestCase):
         self.client.force_authenticate(user=None)
         response = self.client.get(self.profile_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AccountsQueryBudgetTests(APITestCase):
+    def setUp(self):
+        self.data = seed_dataset(hotels=2, rooms_per_hotel=1, bookings_per_room=1, reviews_per_hotel=1)
+
+    def test_account_endpoints_within_query_budget(self):
+        """Test that every budgeted accounts endpoint stays within its query budget"""
+        for endpoint in ENDPOINTS:
+            if not endpoint['name'].startswith('accounts:') or endpoint['budget'] is None:
+                continue
+            with self.subTest(endpoint=endpoint['name']):
+                result = measure_endpoint(self.client, endpoint, self.data)
+                self.assertEqual(result['status'], status.HTTP_200_OK)
+                self.assertLessEqual(result['queries'], endpoint['budget'])
+
+
+class WelcomeEmailTaskTests(APITestCase):
+    def setUp(self):
+        self.register_url = reverse('register')
+        self.user_data = {
+            'email': 'welcome@example.com',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123',
+            'first_name': 'Welcome',
+            'last_name': 'User'
+        }
+
+    def test_registration_enqueues_email_after_commit(self):
+        """Test that registration enqueues the welcome email only once the user is committed"""
+        with mock.patch.object(send_welcome_email_task, 'delay') as delay:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.post(self.register_url, self.user_data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                delay.assert_not_called()
+            for callback in callbacks:
+                callback()
+        user = User.objects.get(email=self.user_data['email'])
+        delay.assert_called_once_with(user.pk)
+
+    def test_registration_survives_broker_outage(self):
+        """Test that an unreachable broker doesn't fail registration"""
+        with mock.patch.object(send_welcome_email_task, 'delay', side_effect=OSError('broker down')):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.register_url, self.user_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_task_sends_welcome_email(self):
+        """Test that the task delivers the welcome email"""
+        user = User.objects.create_user(email='task@example.com', first_name='Task', last_name='User', password='testpass123')
+        result = send_welcome_email_task.apply(args=[user.pk])
+        self.assertTrue(result.get())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [user.email])
+
+    def test_task_retries_smtp_failures(self):
+        """Test that SMTP failures are retried instead of swallowed"""
+        user = User.objects.create_user(email='retry@example.com', first_name='Retry', last_name='User', password='testpass123')
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=SMTPException('relay down')) as send:
+            result = send_welcome_email_task.apply(args=[user.pk])
+        self.assertEqual(result.state, 'FAILURE')
+        self.assertEqual(send.call_count, send_welcome_email_task.max_retries + 1)
+
+    def test_task_skips_deleted_user(self):
+        """Test that the task is a no-op when the user no longer exists"""
+        result = send_welcome_email_task.apply(args=[999999])
+        self.assertFalse(result.get())
+        self.assertEqual(len(mail.outbox), 0)
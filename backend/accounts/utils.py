@@ -3,9 +3,10 @@ from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 
-def send_welcome_email(user):
+def send_welcome_email(user, fail_silently=True):
     """
     Send a welcome email to newly registered users.
+    With fail_silently=False delivery errors are raised so callers can retry.
     """
     # Use production URL if not in debug mode
     site_url = 'https://tripffer.vercel.app' if not settings.DEBUG else 'http://localhost:5173'
@@ -38,5 +39,7 @@ def send_welcome_email(user):
         msg.send()
         return True
     except Exception as e:
+        if not fail_silently:
+            raise
         print(f"Failed to send welcome email: {str(e)}")
         return False 
\ No newline at end of file
@@ -9,9 +9,10 @@ from rest_framework.decorators import api_view, permission_classes
 from datetime import timedelta
 from accounts.models import UserProfile
 from hotels.models import Hotel, HotelImage
+from hotels.images import delete_renditions
 from django.db import transaction
 from rest_framework import serializers
-from .utils import send_welcome_email
+from .tasks import schedule_welcome_email
 from django.contrib.auth import get_user_model
 import logging
 
@@ -72,12 +73,8 @@ class RegisterView(APIView):
                         'detail': str(hotel_error)
                     }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
-            # Send welcome email
-            try:
-                send_welcome_email(user)
-            except Exception:
-                # Silently continue if welcome email fails
-                pass
+            # Send welcome email from a worker after the transaction commits
+            schedule_welcome_email(user)
             
             try:
                 refresh = RefreshToken.for_user(user)
@@ -309,8 +306,12 @@ def _handle_profile_picture_upload(request):
 
         logger.info(f"Uploading profile picture for user: {request.user.email}")
         
-        # Delete old profile picture if it exists
+        # Delete old profile picture and its renditions if it exists
         if request.user.profile.profile_picture:
+            delete_renditions(
+                request.user.profile.profile_picture.storage,
+                request.user.profile.profile_picture_renditions,
+            )
             request.user.profile.profile_picture.delete(save=False)
         
         # Save new profile picture
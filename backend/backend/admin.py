@@ -6,10 +6,14 @@ from hotels.models import Hotel, Booking, Review
 from django.contrib import admin
 from django.db.models.functions import TruncMonth, ExtractMonth
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache
 
 
 AppUser = get_user_model()
 
+DASHBOARD_CACHE_KEY = 'admin:dashboard-stats'
+
 
 class CustomAdminSite(AdminSite):
     def get_app_list(self, request, app_label=None):
@@ -56,23 +60,8 @@ def get_monthly_bookings():
     }
 
 
-def get_revenue_distribution():
+def get_revenue_distribution(total_bookings_value, total_hotels, total_reviews):
     """Get revenue distribution across different categories"""
-    # Get total booking value
-    total_bookings_value = (
-        Booking.objects
-        .filter(status='completed')
-        .aggregate(
-            total=Sum('room__price')
-        )['total'] or 0
-    )
-    
-    # Get total number of active hotels
-    total_hotels = Hotel.objects.filter(user__is_active=True).count()
-    
-    # Get total number of reviews
-    total_reviews = Review.objects.count()
-    
     # Calculate percentages
     total = total_bookings_value + total_hotels + total_reviews
     if total == 0:
@@ -91,35 +80,68 @@ def get_revenue_distribution():
     }
 
 
-def dashboard_callback(request, context):
+def compute_dashboard_stats():
     """
-    Custom dashboard callback for Django Unfold admin
+    Compute the dashboard counters with one conditional aggregate per table
     """
-    # Get current date and time ranges
     today = now().date()
     this_month = today.replace(day=1)
-    last_month = (this_month - timedelta(days=1)).replace(day=1)
-    
-    # User statistics
-    total_users = AppUser.objects.all().count()
-    new_users_this_month = AppUser.objects.filter(date_joined__gte=this_month).count()
-    hotel_owners = AppUser.objects.filter(role='HOTEL').count()
-    regular_users = AppUser.objects.filter(role='USER').count()
-    
-    # Hotel statistics
-    total_hotels = Hotel.objects.all().count()
-    active_hotels = Hotel.objects.filter(user__is_active=True).count()
-    
-    # Booking statistics
-    total_bookings = Booking.objects.all().count()
-    pending_bookings = Booking.objects.filter(status='pending').count()
-    confirmed_bookings = Booking.objects.filter(status='confirmed').count()
-    cancelled_bookings = Booking.objects.filter(status='cancelled').count()
-    this_month_bookings = Booking.objects.filter(start_date__gte=this_month).count()
-    
-    # Review statistics
-    total_reviews = Review.objects.all().count()
-    avg_rating = Review.objects.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
+
+    users = AppUser.objects.aggregate(
+        total=Count('id'),
+        new_this_month=Count('id', filter=Q(date_joined__gte=this_month)),
+        hotel_owners=Count('id', filter=Q(role='HOTEL')),
+        regular_users=Count('id', filter=Q(role='USER')),
+    )
+    hotels = Hotel.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(user__is_active=True)),
+    )
+    bookings = Booking.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        confirmed=Count('id', filter=Q(status='confirmed')),
+        cancelled=Count('id', filter=Q(status='cancelled')),
+        this_month=Count('id', filter=Q(start_date__gte=this_month)),
+        completed_value=Sum('room__price', filter=Q(status='completed')),
+    )
+    reviews = Review.objects.aggregate(
+        total=Count('id'),
+        avg_rating=Avg('rating'),
+    )
+    completed_value = bookings.pop('completed_value') or 0
+    reviews['avg_rating'] = reviews['avg_rating'] or 0
+
+    return {
+        'dashboard_stats': {
+            'users': users,
+            'hotels': hotels,
+            'bookings': bookings,
+            'reviews': reviews,
+        },
+        'analytics': {
+            'monthly_bookings': get_monthly_bookings(),
+            'revenue_distribution': get_revenue_distribution(
+                completed_value, hotels['active'], reviews['total']
+            ),
+        },
+    }
+
+
+def get_dashboard_stats():
+    """
+    Return the dashboard counters, cached for ADMIN_DASHBOARD_CACHE_TTL seconds
+    """
+    return cache.get_or_set(
+        DASHBOARD_CACHE_KEY, compute_dashboard_stats, settings.ADMIN_DASHBOARD_CACHE_TTL
+    )
+
+
+def dashboard_callback(request, context):
+    """
+    Custom dashboard callback for Django Unfold admin
+    """
+    stats = get_dashboard_stats()
     
     # Recent activity
     recent_users = AppUser.objects.order_by('-date_joined')[:5]
@@ -129,45 +151,16 @@ def dashboard_callback(request, context):
     # Top performing hotels
     top_hotels = Hotel.objects.filter(user__is_active=True).order_by('-stars', '-guest_score')[:5]
     
-    # Get analytics data
-    monthly_bookings = get_monthly_bookings()
-    revenue_distribution = get_revenue_distribution()
-    
     # Add custom context data
     context.update({
-        'dashboard_stats': {
-            'users': {
-                'total': total_users,
-                'new_this_month': new_users_this_month,
-                'hotel_owners': hotel_owners,
-                'regular_users': regular_users,
-            },
-            'hotels': {
-                'total': total_hotels,
-                'active': active_hotels,
-            },
-            'bookings': {
-                'total': total_bookings,
-                'pending': pending_bookings,
-                'confirmed': confirmed_bookings,
-                'cancelled': cancelled_bookings,
-                'this_month': this_month_bookings,
-            },
-            'reviews': {
-                'total': total_reviews,
-                'avg_rating': avg_rating,
-            },
-        },
+        'dashboard_stats': stats['dashboard_stats'],
         'recent_activity': {
             'users': recent_users,
             'bookings': recent_bookings,
             'reviews': recent_reviews,
         },
         'top_hotels': top_hotels,
-        'analytics': {
-            'monthly_bookings': monthly_bookings,
-            'revenue_distribution': revenue_distribution,
-        }
+        'analytics': stats['analytics'],
     })
     
     return context
@@ -176,14 +169,14 @@ def dashboard_callback(request, context):
 # Badge count functions for sidebar
 def user_count(request):
     """Return total user count for badge"""
-    return AppUser.objects.all().count()
+    return get_dashboard_stats()['dashboard_stats']['users']['total']
 
 
 def hotel_count(request):
     """Return total hotel count for badge"""
-    return Hotel.objects.all().count()
+    return get_dashboard_stats()['dashboard_stats']['hotels']['total']
 
 
 def pending_bookings_count(request):
     """Return pending bookings count for badge"""
-    return Booking.objects.filter(status='pending').count() 
\ No newline at end of file
+    return get_dashboard_stats()['dashboard_stats']['bookings']['pending']
@@ -0,0 +1,10 @@
+import os
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+app = Celery('backend')
+
+# Read CELERY_* settings from the Django settings module
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
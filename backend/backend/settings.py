@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import sys
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 from django.templatetags.static import static
 from django.urls import reverse_lazy
@@ -44,6 +46,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'corsheaders',
@@ -175,6 +178,34 @@ except Exception as e:
         raise Exception(f"DATABASE_URL configuration error: {e}")
 
 
+# Cache
+# Use Redis when REDIS_URL is configured, otherwise a per-process memory cache
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'tripffer',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Caching search responses needs a cache shared by all workers: with the
+# per-process memory cache a write only invalidates the worker handling it
+HOTEL_SEARCH_CACHE_ENABLED = config('HOTEL_SEARCH_CACHE_ENABLED', default=bool(REDIS_URL), cast=bool)
+# Seconds an anonymous hotel search response stays cached
+HOTEL_SEARCH_CACHE_TTL = config('HOTEL_SEARCH_CACHE_TTL', default=300, cast=int)
+ADMIN_DASHBOARD_CACHE_TTL = config('ADMIN_DASHBOARD_CACHE_TTL', default=60, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -303,7 +334,7 @@ if DEBUG:
 CORS_ALLOW_CREDENTIALS = True
 
 # Additional CORS settings
-CORS_EXPOSE_HEADERS = ['Content-Type', 'X-CSRFToken']
+CORS_EXPOSE_HEADERS = ['Content-Type', 'X-CSRFToken', 'X-Cache']
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -454,6 +485,23 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER)
 
+# Celery Configuration
+# Falls back to the cache's Redis instance when no separate broker is set
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
+# Running tasks in-process puts SMTP and retries back on the request path,
+# so outside development and the test runner it must be opted into
+TESTING = sys.argv[1:2] == ['test']
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=DEBUG or TESTING, cast=bool)
+if not CELERY_TASK_ALWAYS_EAGER and not CELERY_BROKER_URL:
+    # Tasks published without a broker would never reach a worker
+    raise ImproperlyConfigured(
+        'Set CELERY_BROKER_URL or REDIS_URL and run a Celery worker, '
+        'or set CELERY_TASK_ALWAYS_EAGER=True to run tasks in-process.'
+    )
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_TIMEZONE = TIME_ZONE
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -1,5 +1,7 @@
+from botocore.config import Config
 from decouple import config
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 
 # AWS S3 Configuration
 AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID', default=None)
@@ -21,6 +23,15 @@ AWS_S3_OBJECT_PARAMETERS = {
     'CacheControl': 'max-age=86400',  # 24 hours cache
 }
 
+# Concurrent uploads: pool threads each keep a client, and each client keeps
+# up to AWS_S3_MAX_POOL_CONNECTIONS connections alive between requests
+MEDIA_UPLOAD_WORKERS = config('MEDIA_UPLOAD_WORKERS', default=8, cast=int)
+AWS_S3_MAX_POOL_CONNECTIONS = config('AWS_S3_MAX_POOL_CONNECTIONS', default=10, cast=int)
+
+# Direct-to-S3 uploads
+MEDIA_UPLOAD_MAX_BYTES = config('MEDIA_UPLOAD_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+MEDIA_UPLOAD_URL_EXPIRY = config('MEDIA_UPLOAD_URL_EXPIRY', default=600, cast=int)
+
 # Generate custom domain for S3
 if AWS_STORAGE_BUCKET_NAME and AWS_S3_REGION_NAME:
     AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com"
@@ -34,7 +45,29 @@ class MediaStorage(S3Boto3Storage):
     default_acl = None  # Don't set ACL, rely on bucket policy for public access
     querystring_auth = False
     custom_domain = AWS_S3_CUSTOM_DOMAIN if AWS_S3_CUSTOM_DOMAIN else None
+    config = Config(
+        s3={'addressing_style': AWS_S3_ADDRESSING_STYLE},
+        signature_version='s3v4',
+        max_pool_connections=AWS_S3_MAX_POOL_CONNECTIONS,
+        retries={'max_attempts': 3, 'mode': 'standard'},
+    )
     
+    def presigned_post(self, name, content_type, max_size=MEDIA_UPLOAD_MAX_BYTES, expires_in=MEDIA_UPLOAD_URL_EXPIRY):
+        """
+        Return the URL and form fields a client POSTs to upload `name`
+        straight to the bucket, limited to `content_type` and `max_size`.
+        """
+        return self.bucket.meta.client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=self._normalize_name(clean_name(name)),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
+
     def get_accessed_time(self, name):
         return None
 
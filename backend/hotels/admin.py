@@ -1,11 +1,52 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
-from django.db.models import Avg, Count
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from unfold.admin import ModelAdmin, TabularInline, StackedInline
 from django.contrib.admin import SimpleListFilter
 from unfold.decorators import display
-from .models import Hotel, Room, Booking, Review, HotelImage, RoomImage, FavoriteHotel, Feature
+from .models import Hotel, Room, Booking, BookingArchive, Review, HotelImage, RoomImage, FavoriteHotel, Feature, RoomNight
+from . import cache as search_cache
+from .features import feature_catalog
+
+
+def related_count(queryset, field):
+    """
+    COUNT subquery over the rows of `queryset` whose `field` points at the
+    outer row. Unlike Count() across joins, several of these can be combined
+    on one changelist without multiplying each other's rows.
+    """
+    counts = (
+        queryset
+        .filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class FeatureListFilter(SimpleListFilter):
+    """
+    Filter hotels by feature, with choices read from the feature catalog
+    instead of the features table on every changelist load.
+    """
+    title = 'features'
+    parameter_name = 'features__id__exact'
+
+    def lookups(self, request, model_admin):
+        catalog = feature_catalog()
+        return sorted(
+            ((str(feature_id), name) for feature_id, (name, _) in catalog.items()),
+            key=lambda choice: choice[1].lower(),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() and self.value().isdigit():
+            return queryset.filter(features__id=self.value())
+        return queryset
 
 
 class HotelImageInline(TabularInline):
@@ -49,12 +90,13 @@ class HotelAdmin(ModelAdmin):
         'stars',
         'price_per_night',
         'guest_score',
-        'features',
+        FeatureListFilter,
         'user__is_active',
     )
     ordering = ('-id',)
     inlines = [HotelImageInline, RoomInline]
     filter_horizontal = ('features',)
+    readonly_fields = ('guest_score',)
     
     fieldsets = (
         ('Basic Information', {
@@ -79,7 +121,18 @@ class HotelAdmin(ModelAdmin):
         }),
     )
     
-    actions = ['activate_hotels', 'deactivate_hotels', 'reset_guest_scores', 'approve_hotels', 'unapprove_hotels']
+    actions = ['activate_hotels', 'deactivate_hotels', 'reconcile_guest_scores', 'approve_hotels', 'unapprove_hotels']
+
+    def get_queryset(self, request):
+        return (
+            super().get_queryset(request)
+            .select_related('user')
+            .annotate(
+                rooms_total=related_count(Room.objects.all(), 'hotel'),
+                bookings_total=related_count(Booking.objects.all(), 'room__hotel'),
+            )
+            .with_review_aggregates()
+        )
     
     @display(description="Owner")
     def owner_link(self, obj):
@@ -97,25 +150,25 @@ class HotelAdmin(ModelAdmin):
     def location(self, obj):
         return obj.address[:50] + "..." if len(obj.address) > 50 else obj.address
     
-    @display(description="Rooms")
+    @display(description="Rooms", ordering="rooms_total")
     def rooms_count(self, obj):
-        count = obj.rooms.count()
+        count = obj.rooms_total
         if count > 0:
             url = reverse('admin:hotels_room_changelist') + f'?hotel__id__exact={obj.id}'
             return format_html('<a href="{}">{} rooms</a>', url, count)
         return "0 rooms"
     
-    @display(description="Bookings")
+    @display(description="Bookings", ordering="bookings_total")
     def bookings_count(self, obj):
-        count = Booking.objects.filter(room__hotel=obj).count()
+        count = obj.bookings_total
         if count > 0:
             url = reverse('admin:hotels_booking_changelist') + f'?room__hotel__id__exact={obj.id}'
             return format_html('<a href="{}">{} bookings</a>', url, count)
         return "0 bookings"
     
-    @display(description="Avg Rating")
+    @display(description="Avg Rating", ordering="actual_guest_score")
     def avg_rating(self, obj):
-        avg = obj.reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
+        avg = obj.actual_guest_score
         if avg:
             return f"{avg:.1f}/5.0"
         return "-"
@@ -136,11 +189,13 @@ class HotelAdmin(ModelAdmin):
 
     def approve_hotels(self, request, queryset):
         updated = queryset.update(is_approved=True)
+        search_cache.invalidate()
         self.message_user(request, f'{updated} hotels were approved.')
     approve_hotels.short_description = "Approve selected hotels"
     
     def unapprove_hotels(self, request, queryset):
         updated = queryset.update(is_approved=False)
+        search_cache.invalidate()
         self.message_user(request, f'{updated} hotels were unapproved.')
     unapprove_hotels.short_description = "Unapprove selected hotels"
     
@@ -160,10 +215,11 @@ class HotelAdmin(ModelAdmin):
         self.message_user(request, f'{queryset.count()} hotels were deactivated.')
     deactivate_hotels.short_description = "Deactivate selected hotels"
     
-    def reset_guest_scores(self, request, queryset):
-        updated = queryset.update(guest_score=0)
-        self.message_user(request, f'{updated} hotel guest scores were reset.')
-    reset_guest_scores.short_description = "Reset guest scores"
+    def reconcile_guest_scores(self, request, queryset):
+        updated = queryset.reconcile_review_totals()
+        search_cache.invalidate()
+        self.message_user(request, f'{updated} hotel guest scores were recalculated from their reviews.')
+    reconcile_guest_scores.short_description = "Recalculate guest scores from reviews"
 
 
 @admin.register(Room)
@@ -188,6 +244,13 @@ class RoomAdmin(ModelAdmin):
             'fields': ('bed_count', 'max_adults', 'price')
         }),
     )
+
+    def get_queryset(self, request):
+        return (
+            super().get_queryset(request)
+            .select_related('hotel')
+            .annotate(bookings_total=related_count(Booking.objects.all(), 'room'))
+        )
     
     @display(description="Hotel")
     def hotel_link(self, obj):
@@ -198,9 +261,9 @@ class RoomAdmin(ModelAdmin):
     def price_display(self, obj):
         return f"${obj.price}/night" if obj.price else "-"
     
-    @display(description="Bookings")
+    @display(description="Bookings", ordering="bookings_total")
     def bookings_count(self, obj):
-        count = obj.bookings.count()
+        count = obj.bookings_total
         if count > 0:
             url = reverse('admin:hotels_booking_changelist') + f'?room__id__exact={obj.id}'
             return format_html('<a href="{}">{}</a>', url, count)
@@ -229,6 +292,7 @@ class BookingAdmin(ModelAdmin):
     )
     ordering = ('-start_date',)
     date_hierarchy = 'start_date'
+    list_select_related = ('user', 'room__hotel')
     
     fieldsets = (
         ('Booking Information', {
@@ -237,6 +301,9 @@ class BookingAdmin(ModelAdmin):
     )
     
     actions = ['confirm_bookings', 'cancel_bookings']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_total_price()
     
     @display(description="Guest")
     def user_link(self, obj):
@@ -289,16 +356,39 @@ class BookingAdmin(ModelAdmin):
         return "-"
     
     def confirm_bookings(self, request, queryset):
-        updated = queryset.update(status='confirmed')
+        # The changelist filters may stop matching once status changes
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = Booking.objects.filter(pk__in=pks).update(status='confirmed')
+        RoomNight.rebuild(Booking.objects.filter(pk__in=pks))
+        search_cache.invalidate()
         self.message_user(request, f'{updated} bookings were confirmed.')
     confirm_bookings.short_description = "Confirm selected bookings"
     
     def cancel_bookings(self, request, queryset):
-        updated = queryset.update(status='cancelled')
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = Booking.objects.filter(pk__in=pks).update(status='cancelled')
+        RoomNight.objects.filter(booking__in=pks).delete()
+        search_cache.invalidate()
         self.message_user(request, f'{updated} bookings were cancelled.')
     cancel_bookings.short_description = "Cancel selected bookings"
 
 
+@admin.register(BookingArchive)
+class BookingArchiveAdmin(ModelAdmin):
+    list_display = ('booking_id', 'user', 'room', 'start_date', 'end_date', 'status', 'total_price', 'archived_at')
+    list_display_links = ('booking_id',)
+    search_fields = ('booking_id', 'user__email', 'room__hotel__name')
+    list_filter = ('status', 'end_date')
+    ordering = ('-end_date',)
+    list_select_related = ('user', 'room')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Review)
 class ReviewAdmin(ModelAdmin):
     list_display = ('id', 'user_link', 'hotel_link', 'rating_stars', 'comment_preview', 'created_display')
@@ -309,6 +399,7 @@ class ReviewAdmin(ModelAdmin):
         'hotel__stars',
     )
     ordering = ('-created_at',) if hasattr(Review, 'created_at') else ('-id',)
+    list_select_related = ('user', 'hotel')
     
     fieldsets = (
         ('Review Information', {
@@ -348,6 +439,11 @@ class FeatureAdmin(ModelAdmin):
     list_display = ('id', 'name', 'is_amenity_badge', 'hotels_count')
     search_fields = ('name',)
     list_filter = ('is_amenity',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            hotels_total=related_count(Hotel.features.through.objects.all(), 'feature')
+        )
     
     @display(description="Type")
     def is_amenity_badge(self, obj):
@@ -355,9 +451,9 @@ class FeatureAdmin(ModelAdmin):
         color = "success" if obj.is_amenity else "info"
         return format_html('<span class="badge badge-{}">{}</span>', color, label)
     
-    @display(description="Hotels Count")
+    @display(description="Hotels Count", ordering="hotels_total")
     def hotels_count(self, obj):
-        count = obj.hotels.count()
+        count = obj.hotels_total
         if count > 0:
             url = reverse('admin:hotels_hotel_changelist') + f'?features__id__exact={obj.id}'
             return format_html('<a href="{}">{}</a>', url, count)
@@ -369,6 +465,7 @@ class FavoriteHotelAdmin(ModelAdmin):
     list_display = ('id', 'user_link', 'hotel_link', 'created_at')
     search_fields = ('user__email', 'hotel__name')
     list_filter = ('created_at',)
+    list_select_related = ('user', 'hotel')
     
     @display(description="User")
     def user_link(self, obj):
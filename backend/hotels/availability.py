@@ -0,0 +1,95 @@
+"""
+Per-room, per-night availability calendar of a hotel.
+
+The active bookings overlapping the window are read together with the
+hotel's rooms in a single query, then each room's nights are resolved with
+a sweep over its booking intervals instead of one availability check per
+room and date.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from django.db.models import FilteredRelation, Q
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Booking, Room
+
+MAX_CALENDAR_DAYS = 366
+
+
+def calendar_rows(hotel, start_date, end_date):
+    """
+    One row per room and overlapping active booking, or a single row with
+    empty dates for a room without any in the window.
+    """
+    return (
+        Room.objects
+        .filter(hotel=hotel)
+        .annotate(
+            active_booking=FilteredRelation(
+                'bookings',
+                condition=Q(
+                    bookings__status__in=Booking.ACTIVE_STATUSES,
+                    bookings__start_date__lt=end_date,
+                    bookings__end_date__gt=start_date,
+                ),
+            )
+        )
+        .order_by('id', 'active_booking__start_date')
+        .values_list('id', 'room_type', 'active_booking__start_date', 'active_booking__end_date')
+    )
+
+
+def sweep(intervals, nights):
+    """
+    Return how many intervals cover each of the given number of nights,
+    with intervals given as (first night, night after the last) offsets.
+    """
+    changes = [0] * (nights + 1)
+    for first, last in intervals:
+        changes[max(first, 0)] += 1
+        changes[min(last, nights)] -= 1
+
+    occupied = []
+    current = 0
+    for change in changes[:nights]:
+        current += change
+        occupied.append(current)
+    return occupied
+
+
+def availability_calendar(hotel, start_date, end_date):
+    """
+    Build the availability matrix of the hotel's rooms for the nights from
+    start_date up to, but excluding, end_date.
+    """
+    nights = (end_date - start_date).days
+    rooms = {}
+    for room_id, room_type, booked_from, booked_until in calendar_rows(hotel, start_date, end_date):
+        room = rooms.setdefault(room_id, {'room_type': room_type, 'intervals': []})
+        if booked_from is not None:
+            room['intervals'].append(
+                ((booked_from - start_date).days, (booked_until - start_date).days)
+            )
+
+    return {
+        'hotel': hotel.pk,
+        'from': start_date,
+        'to': end_date,
+        'nights': [start_date + timedelta(days=offset) for offset in range(nights)],
+        'rooms': [
+            {
+                'id': room_id,
+                'room_type': room['room_type'],
+                'available': [count == 0 for count in sweep(room['intervals'], nights)],
+            }
+            for room_id, room in rooms.items()
+        ],
+    }
+
+
+def calendar_etag(data):
+    """
+    Strong ETag of a serialized calendar.
+    """
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return '"%s"' % hashlib.sha1(payload.encode()).hexdigest()
@@ -0,0 +1,393 @@
+"""
+Dataset seeding and endpoint measurement used by the query-count
+regression tests and the benchmark_endpoints management command.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import UserProfile
+from .choices import RoomType
+from . import cache as search_cache
+from .features import feature_catalog, invalidate_catalog
+from .models import Hotel, HotelImage, Room, RoomImage, Booking, RoomNight, Review, FavoriteHotel, Feature
+
+User = get_user_model()
+
+BENCHMARK_PASSWORD = 'benchmark-pass-123'
+
+CITIES = ['Sofia', 'Plovdiv', 'Varna', 'Burgas', 'Ruse', 'Bansko', 'Veliko Tarnovo']
+FEATURES = [
+    ('Free WiFi', True), ('Pool', True), ('Parking', True), ('Spa', True), ('Gym', True),
+    ('Sea view', False), ('Mountain view', False), ('Pet friendly', False), ('Rooftop bar', False),
+]
+
+
+@contextmanager
+def throwaway_database(verbosity=0):
+    """
+    Point the default connection at a freshly created test database for
+    the duration of the block and drop it afterwards, so seeding data and
+    dropping indexes never touch (or lock tables in) the live database.
+    """
+    creation = connection.creation
+    old_name = connection.settings_dict['NAME']
+    creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        creation.destroy_test_db(old_name, verbosity=verbosity)
+        # Cached ids and responses came from the throwaway database
+        invalidate_catalog()
+        search_cache.invalidate()
+
+
+def seed_dataset(hotels=1000, rooms_per_hotel=5, bookings_per_room=4, reviews_per_hotel=5,
+                 favorites=20, seed=42):
+    """
+    Bulk-insert a realistic catalog and return the objects endpoints are
+    measured against. Signals are bypassed, so denormalized columns and the
+    availability index are filled in directly.
+    """
+    rng = random.Random(seed)
+    password = make_password(BENCHMARK_PASSWORD)
+    today = date.today()
+
+    guests = User.objects.bulk_create([
+        User(
+            email=f'bench-guest-{index}@example.com',
+            username=f'bench-guest-{index}@example.com',
+            first_name='Bench',
+            last_name=f'Guest {index}',
+            password=password,
+        )
+        for index in range(max(reviews_per_hotel, 1))
+    ])
+    owners = User.objects.bulk_create([
+        User(
+            email=f'bench-owner-{index}@example.com',
+            username=f'bench-owner-{index}@example.com',
+            first_name='Bench',
+            last_name=f'Owner {index}',
+            password=password,
+            role='HOTEL',
+        )
+        for index in range(hotels)
+    ])
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in guests + owners])
+
+    features = Feature.objects.bulk_create([
+        Feature(name=f'Bench {name}', is_amenity=is_amenity) for name, is_amenity in FEATURES
+    ])
+
+    cities = [rng.choice(CITIES) for _ in owners]
+    hotel_objects = Hotel.objects.bulk_create([
+        Hotel(
+            user=owner,
+            name=f'Bench Hotel {index}',
+            address=f'{index} Main St, {city}, Bulgaria',
+            city=city,
+            country='Bulgaria',
+            latitude=round(rng.uniform(41.3, 44.1), 6),
+            longitude=round(rng.uniform(22.4, 28.6), 6),
+            description='Generated for benchmarking',
+            stars=rng.randint(1, 5),
+            distance_to_center=round(rng.uniform(0, 15), 1),
+            is_approved=True,
+        )
+        for index, (owner, city) in enumerate(zip(owners, cities))
+    ])
+
+    Through = Hotel.features.through
+    Through.objects.bulk_create([
+        Through(hotel_id=hotel.id, feature_id=feature.id)
+        for hotel in hotel_objects
+        for feature in rng.sample(features, 4)
+    ], batch_size=1000)
+    Hotel.objects.filter(pk__in=[hotel.pk for hotel in hotel_objects]).update_search_vectors()
+    HotelImage.objects.bulk_create([
+        HotelImage(hotel=hotel, image=f'hotel_images/bench-{hotel.id}-{n}.jpg')
+        for hotel in hotel_objects
+        for n in range(3)
+    ], batch_size=1000)
+
+    rooms = Room.objects.bulk_create([
+        Room(
+            hotel=hotel,
+            price=Decimal(rng.randint(40, 400)),
+            bed_count=rng.randint(1, 3),
+            max_adults=rng.randint(1, 4),
+            room_type=rng.choice(RoomType.values),
+        )
+        for hotel in hotel_objects
+        for _ in range(rooms_per_hotel)
+    ], batch_size=1000)
+    Hotel.objects.filter(pk__in=[hotel.pk for hotel in hotel_objects]).update_average_prices()
+    RoomImage.objects.bulk_create([
+        RoomImage(room=room, image=f'room_images/bench-{room.id}.jpg') for room in rooms
+    ], batch_size=1000)
+
+    bookings = []
+    for room in rooms:
+        start = today + timedelta(days=rng.randint(-30, 10))
+        for _ in range(bookings_per_room):
+            end = start + timedelta(days=rng.randint(1, 7))
+            bookings.append(Booking(
+                room=room,
+                user=rng.choice(guests),
+                start_date=start,
+                end_date=end,
+                status=rng.choice(['pending', 'confirmed', 'cancelled', 'completed']),
+            ))
+            start = end + timedelta(days=rng.randint(0, 5))
+    bookings = Booking.objects.bulk_create(bookings, batch_size=1000)
+    RoomNight.rebuild(bookings)
+
+    Review.objects.bulk_create([
+        Review(hotel=hotel, user=guest, rating=rng.randint(1, 5), comment='Benchmark review')
+        for hotel in hotel_objects
+        for guest in guests[:reviews_per_hotel]
+    ], batch_size=1000)
+    Hotel.objects.filter(pk__in=[hotel.pk for hotel in hotel_objects]).reconcile_review_totals()
+    FavoriteHotel.objects.bulk_create([
+        FavoriteHotel(user=guests[0], hotel=hotel) for hotel in hotel_objects[:favorites]
+    ])
+    search_cache.invalidate()
+    # Features were bulk-inserted without signals
+    invalidate_catalog()
+
+    return {
+        'guest': guests[0],
+        'owner': owners[0],
+        'hotel': hotel_objects[0],
+        'room': rooms[0],
+        'booking': bookings[0],
+        'check_in': today + timedelta(days=3),
+        'check_out': today + timedelta(days=5),
+        'counts': {
+            'hotels': len(hotel_objects),
+            'rooms': len(rooms),
+            'bookings': len(bookings),
+            'reviews': Review.objects.count(),
+        },
+    }
+
+
+# Each endpoint is requested as `user` ('guest', 'owner' or None) and must
+# not exceed `budget` queries, however large the seeded dataset is.
+ENDPOINTS = [
+    {
+        'name': 'hotels:search-list',
+        'path': lambda data: reverse('hotel-list'),
+        'user': None,
+        'budget': 2,
+    },
+    {
+        'name': 'hotels:search-list-dates',
+        'path': lambda data: reverse('hotel-list') + (
+            f"?city=Sofia&beds=1&adults=1"
+            f"&check_in={data['check_in'].isoformat()}&check_out={data['check_out'].isoformat()}"
+        ),
+        'user': None,
+        'budget': 2,
+    },
+    {
+        'name': 'hotels:search-list-ranked',
+        'path': lambda data: reverse('hotel-list') + '?' + urlencode({
+            'ordering': '-score',
+            'price_min': 50,
+            'stars_min': 3,
+            'amenities': f'Bench {FEATURES[0][0]},Bench {FEATURES[1][0]}',
+        }),
+        'user': None,
+        'budget': 2,
+    },
+    {
+        'name': 'hotels:search-detail',
+        'path': lambda data: reverse('hotel-detail', args=[data['hotel'].id]),
+        'user': None,
+        'budget': 5,
+    },
+    {
+        'name': 'hotels:booking-list',
+        'path': lambda data: reverse('booking-list'),
+        'user': 'guest',
+        'budget': 3,
+    },
+    {
+        'name': 'hotels:booking-list-compact',
+        'path': lambda data: reverse('booking-list') + '?compact=1',
+        'user': 'guest',
+        'budget': 2,
+    },
+    {
+        'name': 'hotels:room-list',
+        'path': lambda data: reverse('room-list'),
+        'user': 'owner',
+        'budget': 2,
+    },
+    {
+        'name': 'hotels:favoritehotel-list',
+        'path': lambda data: reverse('favoritehotel-list'),
+        'user': 'guest',
+        'budget': 2,
+    },
+    {
+        'name': 'hotels:review-list',
+        'path': lambda data: reverse('review-list') + f"?hotel_id={data['hotel'].id}",
+        'user': None,
+        'budget': 1,
+    },
+    {
+        'name': 'hotels:my-hotel-list',
+        'path': lambda data: reverse('my-hotel-list'),
+        'user': 'owner',
+        'budget': 5,
+    },
+    {
+        'name': 'hotels:my-hotel-bookings',
+        'path': lambda data: reverse('my-hotel-bookings'),
+        'user': 'owner',
+        'budget': 3,
+    },
+    {
+        'name': 'accounts:user-profile',
+        'path': lambda data: reverse('user-profile'),
+        'user': 'guest',
+        'budget': 2,
+    },
+    {
+        'name': 'accounts:login',
+        'path': lambda data: reverse('login'),
+        'method': 'post',
+        'payload': lambda data: {'email': data['guest'].email, 'password': BENCHMARK_PASSWORD},
+        'user': None,
+        'budget': 4,
+    },
+]
+
+
+# Indexes on the search and booking hot paths, compared by explain_indexes
+HOT_PATH_INDEXES = {
+    'hotels_booking_active_dates',
+    'hotels_booking_status_start',
+    'hotels_hotel_approved_id',
+    'hotels_hotel_approved_price',
+    'hotels_hotel_approved_stars',
+    'hotels_hotel_approved_score',
+    'hotels_hotel_approved_distance',
+    'hotels_room_hotel_capacity',
+}
+
+# Representative queries of Room.is_available, HotelViewSet and the dashboard
+PLAN_QUERIES = [
+    {
+        'name': 'booking-overlap',
+        'queryset': lambda data: Booking.objects.filter(
+            room=data['room'], status__in=Booking.ACTIVE_STATUSES,
+            start_date__lt=data['check_out'], end_date__gt=data['check_in']
+        ).values('id')[:1],
+    },
+    {
+        'name': 'pending-bookings',
+        'queryset': lambda data: Booking.objects.filter(status='pending').values('id'),
+    },
+    {
+        'name': 'approved-hotels-page',
+        'queryset': lambda data: Hotel.objects.filter(is_approved=True).order_by('id').values('id')[:21],
+    },
+    {
+        'name': 'cheapest-hotels-page',
+        'queryset': lambda data: Hotel.objects.filter(
+            is_approved=True
+        ).ranked_by('price_per_night').values('id')[:21],
+    },
+    {
+        'name': 'best-rated-hotels-page',
+        'queryset': lambda data: Hotel.objects.filter(
+            is_approved=True
+        ).ranked_by('guest_score', descending=True).values('id')[:21],
+    },
+    {
+        'name': 'hotel-rooms-by-capacity',
+        'queryset': lambda data: Room.objects.filter(
+            hotel=data['hotel'], bed_count__gte=1, max_adults__gte=2
+        ).values('id'),
+    },
+]
+
+
+def explain_plans(data):
+    """
+    Return the database's query plan for every query in PLAN_QUERIES.
+    """
+    with connection.cursor() as cursor:
+        # Refresh planner statistics for the freshly seeded tables
+        cursor.execute('ANALYZE')
+    return {query['name']: query['queryset'](data).explain() for query in PLAN_QUERIES}
+
+
+def drop_hot_path_indexes():
+    """
+    Drop the HOT_PATH_INDEXES; meant to run inside a transaction that is
+    rolled back. The statements are executed directly because the SQLite
+    schema editor can't be entered inside a transaction.
+    """
+    editor = connection.schema_editor()
+    with connection.cursor() as cursor:
+        for model in (Hotel, Room, Booking):
+            for index in model._meta.indexes:
+                if index.name in HOT_PATH_INDEXES:
+                    cursor.execute(str(index.remove_sql(model, editor)))
+
+
+def measure_endpoint(client, endpoint, data, iterations=1):
+    """
+    Request an endpoint `iterations` times and return its status code,
+    the highest query count seen and latency percentiles in ms.
+    """
+    user = data[endpoint['user']] if endpoint['user'] else None
+    client.force_authenticate(user=user)
+    method = getattr(client, endpoint.get('method', 'get'))
+    path = endpoint['path'](data)
+    payload = endpoint['payload'](data) if 'payload' in endpoint else None
+
+    timings = []
+    queries = 0
+    for _ in range(iterations):
+        # Measure the database path rather than search cache hits
+        search_cache.invalidate()
+        # The feature catalog is process state that only reloads after a
+        # Feature write, so warm it like a long-running worker would have
+        feature_catalog()
+        # The debug query log is a bounded deque; start each request empty
+        # so large responses can't push the capture window past its end.
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = method(path, payload, format='json') if payload else method(path)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(context.captured_queries))
+    client.force_authenticate(user=None)
+
+    if len(timings) > 1:
+        p95 = statistics.quantiles(timings, n=20)[-1]
+    else:
+        p95 = timings[0]
+    return {
+        'status': response.status_code,
+        'queries': queries,
+        'budget': endpoint['budget'],
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(p95, 2),
+    }
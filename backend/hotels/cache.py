@@ -0,0 +1,92 @@
+"""
+Response cache for hotel search.
+
+Every key embeds a generation number; signals bump the generation on any
+write that can change search results, which invalidates all entries at
+once without having to track individual keys.
+
+Responses are only cached when HOTEL_SEARCH_CACHE_ENABLED is set, which
+defaults to whether Redis is configured. Other workers would never see
+the generation bump in a per-process memory cache.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_KEY = 'hotels:search:generation'
+HITS_KEY = 'hotels:search:hits'
+MISSES_KEY = 'hotels:search:misses'
+
+
+def enabled():
+    return settings.HOTEL_SEARCH_CACHE_ENABLED
+
+
+def current_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seed with a timestamp so a generation lost to eviction can never
+        # fall back to a value that older entries were stored under
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def invalidate():
+    """
+    Drop every cached search response.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        current_generation()
+
+
+def normalize_params(query_params):
+    """
+    Return the query parameters as a canonical, sorted list so equivalent
+    searches share a cache entry.
+    """
+    params = []
+    for key in sorted(query_params):
+        values = [' '.join(value.split()) for value in query_params.getlist(key)]
+        values = sorted(value for value in values if value)
+        if key in ('city', 'city_exact', 'country', 'q'):
+            values = [value.lower() for value in values]
+        if values:
+            params.append((key, values))
+    return params
+
+
+def make_key(request, action, pk=None):
+    digest = hashlib.sha1(
+        urlencode(normalize_params(request.query_params), doseq=True).encode()
+    ).hexdigest()
+    return f'hotels:search:{current_generation()}:{request.get_host()}:{action}:{pk}:{digest}'
+
+
+def get_response(key):
+    data = cache.get(key)
+    counter = MISSES_KEY if data is None else HITS_KEY
+    cache.add(counter, 0, timeout=None)
+    cache.incr(counter)
+    return data
+
+
+def store_response(key, data):
+    cache.set(key, data, timeout=settings.HOTEL_SEARCH_CACHE_TTL)
+
+
+def stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'enabled': enabled(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+        'ttl': settings.HOTEL_SEARCH_CACHE_TTL,
+    }
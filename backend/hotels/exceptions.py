@@ -0,0 +1,20 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class BookingConflict(APIException):
+    """
+    Raised when the requested dates overlap an existing booking of the room.
+    """
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This room is not available for the selected dates."
+    default_code = 'booking_conflict'
+
+
+class DirectUploadUnavailable(APIException):
+    """
+    Raised when presigned uploads are requested but media is not stored on S3.
+    """
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Direct uploads require S3 media storage."
+    default_code = 'direct_upload_unavailable'
@@ -0,0 +1,167 @@
+"""
+Bulk feature upserts and the shared feature catalog.
+
+Owners can submit dozens of feature names at once. Names are resolved to
+ids with one lookup for the unknown ones and one insert for the missing
+ones, and the hotel's feature set is then updated by difference instead of
+being rewritten.
+
+Serializers and admin filters read feature names and the amenity flag from
+a catalog of the whole table. It is stored in the cache backend under a
+version number that Feature writes bump, and each process keeps the copy
+for the version it last saw. The version is only shared between workers
+when the cache backend is (Redis); with the per-process memory cache a
+worker notices changes made elsewhere once CATALOG_TTL has passed.
+"""
+import time
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from .models import Feature
+
+# Feature names are unique and rarely renamed or deleted, so ids resolved
+# by this process are remembered. Signals clear entries on Feature writes;
+# an id deleted by another process is caught when linking fails.
+_feature_ids = {}
+MAX_CACHED_FEATURES = 5000
+
+
+def clean_feature_names(value):
+    """
+    Split a list or comma-separated string of feature names, dropping blanks
+    and duplicates while keeping their order.
+    """
+    if isinstance(value, list):
+        names = [str(name).strip() for name in value]
+    else:
+        names = [name.strip() for name in str(value).split(',')]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def forget_feature(name):
+    _feature_ids.pop(name, None)
+
+
+def clear_feature_cache():
+    _feature_ids.clear()
+
+
+CATALOG_VERSION_KEY = 'hotels:features:version'
+# Seconds a catalog is trusted without a version change
+CATALOG_TTL = 60
+
+# (version, loaded at, {id: (name, is_amenity)}) replaced as a whole so
+# concurrent readers never see a half-built catalog
+_catalog = (None, 0, {})
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seeded with a timestamp for the same reason as the search cache
+        # generation: an evicted counter must not reuse an old version
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def invalidate_catalog():
+    """
+    Make every process reload the feature catalog on its next read.
+    """
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        catalog_version()
+
+
+def feature_catalog():
+    """
+    Return {feature id: (name, is_amenity)} for every feature, costing one
+    cache read while the catalog is unchanged.
+    """
+    global _catalog
+    version = catalog_version()
+    loaded_version, loaded_at, features = _catalog
+    if loaded_version != version or time.monotonic() - loaded_at > CATALOG_TTL:
+        key = f'hotels:features:catalog:{version}'
+        features = cache.get(key)
+        if features is None:
+            features = {
+                feature_id: (name, is_amenity)
+                for feature_id, name, is_amenity in Feature.objects.values_list('id', 'name', 'is_amenity')
+            }
+            cache.set(key, features, timeout=CATALOG_TTL)
+        _catalog = (version, time.monotonic(), features)
+    return features
+
+
+def split_features(feature_ids):
+    """
+    Map feature ids to (feature names, amenity names) using the catalog.
+    """
+    catalog = feature_catalog()
+    if any(feature_id not in catalog for feature_id in feature_ids):
+        # Written without signals (e.g. bulk_create elsewhere); reload once
+        invalidate_catalog()
+        catalog = feature_catalog()
+    features, amenities = [], []
+    for feature_id in feature_ids:
+        if feature_id in catalog:
+            name, is_amenity = catalog[feature_id]
+            (amenities if is_amenity else features).append(name)
+    return features, amenities
+
+
+def resolve_feature_ids(names):
+    """
+    Map feature names to ids, creating the features that don't exist yet
+    as non-amenities.
+    """
+    ids = {name: _feature_ids[name] for name in names if name in _feature_ids}
+    missing = [name for name in names if name not in ids]
+    if missing:
+        found = dict(Feature.objects.filter(name__in=missing).values_list('name', 'id'))
+        to_create = [name for name in missing if name not in found]
+        if to_create:
+            # Concurrent requests may insert the same names; whoever loses
+            # the race just reads the winner's rows back
+            Feature.objects.bulk_create(
+                [Feature(name=name, is_amenity=False) for name in to_create],
+                ignore_conflicts=True,
+            )
+            # bulk_create sends no signals
+            invalidate_catalog()
+            found.update(Feature.objects.filter(name__in=to_create).values_list('name', 'id'))
+        ids.update(found)
+        if len(_feature_ids) + len(found) > MAX_CACHED_FEATURES:
+            _feature_ids.clear()
+        _feature_ids.update(found)
+    return [ids[name] for name in names]
+
+
+def set_hotel_features(hotel, names):
+    """
+    Make the named features the hotel's non-amenity features, keeping the
+    amenities it already has. Only the links that change are written.
+    """
+    try:
+        with transaction.atomic():
+            _apply_hotel_features(hotel, names)
+    except IntegrityError:
+        # A remembered id was deleted elsewhere; resolve everything again
+        clear_feature_cache()
+        with transaction.atomic():
+            _apply_hotel_features(hotel, names)
+
+
+def _apply_hotel_features(hotel, names):
+    current = dict(hotel.features.values_list('id', 'is_amenity'))
+    wanted = set(resolve_feature_ids(names))
+    wanted.update(feature_id for feature_id, is_amenity in current.items() if is_amenity)
+
+    to_remove = set(current) - wanted
+    to_add = wanted - set(current)
+    if to_remove:
+        hotel.features.remove(*to_remove)
+    if to_add:
+        hotel.features.add(*to_add)
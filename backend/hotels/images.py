@@ -0,0 +1,80 @@
+"""
+Resized renditions of uploaded images, generated off-request by
+hotels.tasks.generate_renditions and recorded on the owning model.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+# Bounding boxes; images are scaled down to fit and never enlarged
+RENDITION_SIZES = {
+    'thumbnail': (320, 240),
+    'card': (800, 600),
+    'full': (1920, 1440),
+}
+
+
+def rendition_format():
+    """
+    WebP where the installed Pillow can encode it, JPEG otherwise.
+    """
+    return ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+
+def build_renditions(field_file):
+    """
+    Write every rendition of `field_file` next to the original and return
+    a mapping of rendition name to storage path. The mapping records the
+    source file under 'source' so stale renditions can be detected.
+    """
+    storage = field_file.storage
+    image_format, extension = rendition_format()
+    base, _ = os.path.splitext(field_file.name)
+
+    with field_file.open('rb') as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original.load()
+    if original.mode not in ('RGB', 'RGBA') or image_format == 'JPEG':
+        original = original.convert('RGB')
+
+    renditions = {'source': field_file.name}
+    for name, size in RENDITION_SIZES.items():
+        resized = original.copy()
+        resized.thumbnail(size, Image.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, image_format, quality=82)
+        renditions[name] = storage.save(f'{base}_{name}.{extension}', ContentFile(buffer.getvalue()))
+    return renditions
+
+
+def delete_renditions(storage, renditions):
+    """
+    Remove the files of a renditions mapping from storage.
+    """
+    for name in RENDITION_SIZES:
+        if renditions.get(name):
+            storage.delete(renditions[name])
+
+
+def renditions_are_current(field_file, renditions):
+    """
+    Whether `renditions` were generated from the file currently stored.
+    """
+    return bool(field_file) and bool(renditions) and renditions.get('source') == field_file.name
+
+
+def rendition_urls(field_file, renditions, request=None):
+    """
+    URLs of every rendition, falling back to the original file while
+    renditions are still being generated.
+    """
+    if not field_file:
+        return {}
+    current = renditions_are_current(field_file, renditions)
+    urls = {}
+    for name in RENDITION_SIZES:
+        url = field_file.storage.url(renditions[name]) if current else field_file.url
+        urls[name] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,98 @@
+"""
+Structured hotel locations: city and country parsed from the free-text
+address, optional geocoding, and radius search without PostGIS.
+"""
+import math
+import re
+
+import requests
+from django.db.models import DecimalField, F, FloatField
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LATITUDE = 111.045
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+
+POSTAL_CODE = re.compile(r'\b\d{3,}\b')
+
+
+def parse_address(address):
+    """
+    Split an address such as '12 Vitosha Blvd, 1000 Sofia, Bulgaria' into
+    (city, country). The last comma-separated part is taken as the country
+    and the one before it as the city, without postal codes. Returns empty
+    strings for parts that cannot be told apart.
+    """
+    parts = [part.strip() for part in (address or '').split(',') if part.strip()]
+    if len(parts) < 2:
+        return '', ''
+    city = ' '.join(POSTAL_CODE.sub('', parts[-2]).split())
+    country = ' '.join(POSTAL_CODE.sub('', parts[-1]).split())
+    return city[:100], country[:100]
+
+
+def geocode(address, timeout=10):
+    """
+    Look up (latitude, longitude) for an address with OpenStreetMap
+    Nominatim, or None when it cannot be found.
+    """
+    response = requests.get(
+        NOMINATIM_URL,
+        params={'q': address, 'format': 'json', 'limit': 1},
+        headers={'User-Agent': 'tripffer-backend/1.0'},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    results = response.json()
+    if not results:
+        return None
+    return float(results[0]['lat']), float(results[0]['lon'])
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Latitude and longitude ranges enclosing the circle of `radius_km`
+    around a point, used to prefilter with the (latitude, longitude) index.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE_LATITUDE
+    lon_scale = max(math.cos(math.radians(latitude)), 0.01)
+    lon_delta = radius_km / (KM_PER_DEGREE_LATITUDE * lon_scale)
+    return (
+        (latitude - lat_delta, latitude + lat_delta),
+        (longitude - lon_delta, longitude + lon_delta),
+    )
+
+
+def haversine_km(latitude, longitude):
+    """
+    Database expression for the great-circle distance in km between each
+    row's coordinates and the given point.
+    """
+    lat = Radians(F('latitude'))
+    lat_delta = Radians(F('latitude') - latitude)
+    lon_delta = Radians(F('longitude') - longitude)
+    a = (
+        Power(Sin(lat_delta / 2), 2)
+        + math.cos(math.radians(latitude)) * Cos(lat) * Power(Sin(lon_delta / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a), output_field=FloatField())
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Hotels within `radius_km` of a point, nearest first, annotated with
+    `distance_km`.
+    """
+    radius_km = min(radius_km, MAX_RADIUS_KM)
+    lat_range, lon_range = bounding_box(latitude, longitude, radius_km)
+    return (
+        queryset
+        .filter(latitude__range=lat_range, longitude__range=lon_range)
+        # Rounded to a decimal so the value survives the pagination cursor
+        .annotate(distance_km=Cast(haversine_km(latitude, longitude), DecimalField(max_digits=9, decimal_places=3)))
+        .filter(distance_km__lte=radius_km)
+        .order_by('distance_km', 'id')
+    )
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from hotels.models import Booking, BookingArchive
+from hotels import cache as search_cache
+
+class Command(BaseCommand):
+    help = 'Moves completed and cancelled bookings that ended long ago to the booking archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Archive bookings that ended more than this many days ago',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of bookings archived per transaction',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many bookings would be archived',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now().date() - timedelta(days=options['days'])
+        bookings = Booking.objects.filter(
+            status__in=Booking.ARCHIVABLE_STATUSES,
+            end_date__lt=cutoff,
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{bookings.count()} bookings would be archived')
+            return
+
+        chunk_size = options['chunk_size']
+        archived_count = 0
+        while True:
+            # Each chunk is copied and deleted in its own transaction so a
+            # long run never holds locks on the bookings table for long
+            with transaction.atomic():
+                chunk = list(
+                    bookings.select_related('room').order_by('pk')[:chunk_size]
+                )
+                if not chunk:
+                    break
+                BookingArchive.objects.bulk_create(
+                    [BookingArchive.from_booking(booking) for booking in chunk],
+                    ignore_conflicts=True,
+                )
+                Booking.objects.filter(pk__in=[booking.pk for booking in chunk]).delete()
+            archived_count += len(chunk)
+
+        search_cache.invalidate()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully archived {archived_count} bookings'
+            )
+        )
@@ -0,0 +1,58 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from hotels.models import Hotel
+from hotels.locations import parse_address, geocode
+from hotels import cache as search_cache
+
+class Command(BaseCommand):
+    help = 'Fills hotel city and country from their addresses and optionally geocodes coordinates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-parse every hotel, not only those without a city',
+        )
+        parser.add_argument(
+            '--geocode',
+            action='store_true',
+            help='Look up missing coordinates with OpenStreetMap Nominatim',
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between geocoding requests (Nominatim allows one per second)',
+        )
+
+    def handle(self, *args, **options):
+        hotels = Hotel.objects.all() if options['force'] else Hotel.objects.filter(city='')
+        parsed = []
+        for hotel in hotels.only('id', 'address').iterator():
+            hotel.city, hotel.country = parse_address(hotel.address)
+            if hotel.city:
+                parsed.append(hotel)
+        Hotel.objects.bulk_update(parsed, ['city', 'country'], batch_size=500)
+
+        geocoded = []
+        if options['geocode']:
+            missing = Hotel.objects.filter(Q(latitude__isnull=True) | Q(longitude__isnull=True))
+            for hotel in missing.only('id', 'address').iterator():
+                try:
+                    coordinates = geocode(hotel.address)
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f'Failed to geocode hotel {hotel.pk}: {str(e)}'))
+                    coordinates = None
+                if coordinates:
+                    hotel.latitude, hotel.longitude = coordinates
+                    geocoded.append(hotel)
+                time.sleep(options['delay'])
+            Hotel.objects.bulk_update(geocoded, ['latitude', 'longitude'], batch_size=500)
+
+        search_cache.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully parsed {len(parsed)} and geocoded {len(geocoded)} hotel locations'
+            )
+        )
@@ -0,0 +1,70 @@
+import json
+from contextlib import nullcontext
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+from hotels.benchmark import throwaway_database, ENDPOINTS, seed_dataset, measure_endpoint
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a generated dataset, measures query counts and p50/p95 latency '
+        'of every hotels and accounts endpoint and writes a JSON report. '
+        'Runs in a throwaway test database unless --current-database is given; '
+        'all generated data is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=1000)
+        parser.add_argument('--rooms-per-hotel', type=int, default=5)
+        parser.add_argument('--bookings-per-room', type=int, default=4)
+        parser.add_argument(
+            '--current-database',
+            action='store_true',
+            help='Seed into the configured database instead of a throwaway one; '
+                 'only use this against a disposable database',
+        )
+        parser.add_argument('--reviews-per-hotel', type=int, default=5)
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--output', default='benchmark_report.json')
+
+    def handle(self, *args, **options):
+        report = {
+            'generated_at': now().isoformat(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'endpoints': {},
+        }
+
+        database = nullcontext() if options['current_database'] else throwaway_database()
+        with database, transaction.atomic():
+            self.stdout.write('Seeding benchmark dataset...')
+            data = seed_dataset(
+                hotels=options['hotels'],
+                rooms_per_hotel=options['rooms_per_hotel'],
+                bookings_per_room=options['bookings_per_room'],
+                reviews_per_hotel=options['reviews_per_hotel'],
+            )
+            report['dataset'] = data['counts']
+
+            client = APIClient()
+            for endpoint in ENDPOINTS:
+                result = measure_endpoint(client, endpoint, data, iterations=options['iterations'])
+                report['endpoints'][endpoint['name']] = result
+                self.stdout.write(
+                    f"{endpoint['name']}: {result['queries']} queries "
+                    f"(budget {result['budget']}), p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms"
+                )
+
+            transaction.set_rollback(True)
+
+        with open(options['output'], 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        over_budget = [
+            name for name, result in report['endpoints'].items()
+            if result['budget'] is not None and result['queries'] > result['budget']
+        ]
+        if over_budget:
+            raise CommandError(f"Query budget exceeded for: {', '.join(over_budget)}")
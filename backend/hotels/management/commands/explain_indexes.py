@@ -0,0 +1,64 @@
+import json
+from contextlib import nullcontext
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from hotels.benchmark import throwaway_database, PLAN_QUERIES, seed_dataset, explain_plans, drop_hot_path_indexes
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a generated dataset and prints the EXPLAIN plans of the booking '
+        'overlap and hotel filter queries with and without the hot-path indexes. '
+        'Runs in a throwaway test database unless --current-database is given; '
+        'all generated data and dropped indexes are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=1000)
+        parser.add_argument('--rooms-per-hotel', type=int, default=5)
+        parser.add_argument('--bookings-per-room', type=int, default=4)
+        parser.add_argument(
+            '--current-database',
+            action='store_true',
+            help='Seed into the configured database instead of a throwaway one; '
+                 'only use this against a disposable database',
+        )
+        parser.add_argument('--output', help='Also write the plans to this JSON file')
+
+    def handle(self, *args, **options):
+        database = nullcontext() if options['current_database'] else throwaway_database()
+        with database, transaction.atomic():
+            self.stdout.write('Seeding dataset...')
+            data = seed_dataset(
+                hotels=options['hotels'],
+                rooms_per_hotel=options['rooms_per_hotel'],
+                bookings_per_room=options['bookings_per_room'],
+            )
+            with_indexes = explain_plans(data)
+            drop_hot_path_indexes()
+            without_indexes = explain_plans(data)
+            transaction.set_rollback(True)
+
+        for query in PLAN_QUERIES:
+            name = query['name']
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name} =='))
+            self.stdout.write('-- without hot-path indexes --')
+            self.stdout.write(without_indexes[name])
+            self.stdout.write('-- with hot-path indexes --')
+            self.stdout.write(with_indexes[name])
+            self.stdout.write('')
+
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                json.dump({
+                    'database': connection.vendor,
+                    'dataset': data['counts'],
+                    'plans': {
+                        query['name']: {
+                            'without_indexes': without_indexes[query['name']],
+                            'with_indexes': with_indexes[query['name']],
+                        }
+                        for query in PLAN_QUERIES
+                    },
+                }, report_file, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully explained {len(PLAN_QUERIES)} queries'))
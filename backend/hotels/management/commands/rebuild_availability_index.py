@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from hotels.models import Booking, RoomNight
+from hotels import cache as search_cache
+
+class Command(BaseCommand):
+    help = 'Rebuilds the room-night availability index from the bookings table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of bookings indexed per batch',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        indexed_count = 0
+
+        with transaction.atomic():
+            RoomNight.objects.all().delete()
+
+            chunk = []
+            for booking in Booking.objects.filter(status__in=Booking.ACTIVE_STATUSES).iterator(chunk_size=chunk_size):
+                chunk.append(booking)
+                if len(chunk) >= chunk_size:
+                    RoomNight.rebuild(chunk)
+                    indexed_count += len(chunk)
+                    chunk = []
+            if chunk:
+                RoomNight.rebuild(chunk)
+                indexed_count += len(chunk)
+
+        search_cache.invalidate()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully indexed {indexed_count} bookings'
+            )
+        )
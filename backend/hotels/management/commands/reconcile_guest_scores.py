@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from hotels.models import Hotel
+from hotels import cache as search_cache
+
+class Command(BaseCommand):
+    help = 'Recomputes hotel review totals and guest scores that drifted from their reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report hotels whose totals drifted',
+        )
+
+    def handle(self, *args, **options):
+        drifted_ids = list(Hotel.objects.drifted().values_list('pk', flat=True))
+
+        for hotel in Hotel.objects.filter(pk__in=drifted_ids).with_review_aggregates():
+            self.stdout.write(
+                f"Drift for hotel {hotel.name}: "
+                f"{hotel.review_count} reviews/{hotel.review_rating_sum} points/score {hotel.guest_score} stored, "
+                f"{hotel.actual_review_count} reviews/{hotel.actual_rating_sum} points/score {hotel.actual_guest_score} actual"
+            )
+
+        if options['dry_run']:
+            self.stdout.write(f'{len(drifted_ids)} hotels need reconciliation')
+            return
+
+        updated_count = Hotel.objects.filter(pk__in=drifted_ids).reconcile_review_totals()
+        search_cache.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully reconciled guest scores for {updated_count} hotels'
+            )
+        )
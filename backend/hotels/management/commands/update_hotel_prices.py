@@ -1,20 +1,32 @@
 from django.core.management.base import BaseCommand
 from hotels.models import Hotel
+from hotels import cache as search_cache
 
 class Command(BaseCommand):
     help = 'Updates all hotel price_per_night fields based on the average of their room prices'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Recompute every hotel with a single UPDATE statement',
+        )
+
     def handle(self, *args, **kwargs):
-        hotels = Hotel.objects.all()
-        updated_count = 0
+        if kwargs['bulk']:
+            updated_count = Hotel.objects.update_average_prices()
+            search_cache.invalidate()
+        else:
+            hotels = Hotel.objects.all()
+            updated_count = 0
 
-        for hotel in hotels:
-            hotel.update_average_price()
-            updated_count += 1
-            self.stdout.write(f"Updated price for hotel: {hotel.name}")
+            for hotel in hotels:
+                hotel.update_average_price()
+                updated_count += 1
+                self.stdout.write(f"Updated price for hotel: {hotel.name}")
 
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully updated prices for {updated_count} hotels'
             )
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,198 @@
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import (
+    Avg, Case, Count, DecimalField, ExpressionWrapper, F, FloatField, Func, IntegerField,
+    OuterRef, Prefetch, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce
+
+# Stand-ins for a missing value of a ranked hotel field that sort after
+# every real value, in ascending and descending order respectively
+RANKING_MISSING = {
+    'price_per_night': (Decimal('99999999.99'), Decimal('-1')),
+    'guest_score': (1e9, -1.0),
+    'distance_to_center': (1e9, -1.0),
+}
+
+
+def ranking_key(field, descending=False):
+    """
+    Non-null sort key for a hotel field, placing hotels without a value
+    last in either direction. The cursor pagination positions on it.
+    """
+    if field not in RANKING_MISSING:
+        return F(field)
+    last_ascending, last_descending = RANKING_MISSING[field]
+    return Coalesce(F(field), Value(last_descending if descending else last_ascending))
+
+
+def hotel_detail_prefetches(prefix=''):
+    """
+    Return the prefetch lookups HotelSerializer reads from, optionally
+    prefixed so they can be applied through a relation (e.g. 'hotel__').
+    Only feature ids are loaded; names come from the feature catalog.
+    """
+    from .models import Feature
+
+    return [
+        f'{prefix}images',
+        Prefetch(f'{prefix}features', queryset=Feature.objects.only('id')),
+        f'{prefix}rooms__images',
+    ]
+
+
+class HotelQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        Prefetch images, features and rooms with their images so that
+        serializing any number of hotels costs a constant number of queries.
+        """
+        return self.prefetch_related(*hotel_detail_prefetches())
+
+    def ranked_by(self, field, descending=False):
+        """
+        Order by `field` with hotels lacking a value last, annotating the
+        sort key as `ranking_value`. The id tie-breaker follows the same
+        direction so an index on (key, id) can be scanned either way.
+        """
+        prefix = '-' if descending else ''
+        return (
+            self
+            .annotate(ranking_value=ranking_key(field, descending))
+            .order_by(f'{prefix}ranking_value', f'{prefix}id')
+        )
+
+    def update_average_prices(self):
+        """
+        Recompute price_per_night for every hotel in the queryset from its
+        rooms with a single UPDATE statement.
+        """
+        from .models import Room
+
+        average_price = (
+            Room.objects
+            .filter(hotel=OuterRef('pk'))
+            .order_by()
+            .values('hotel')
+            .annotate(average=Avg('price'))
+            .values('average')
+        )
+        return self.update(price_per_night=Subquery(average_price))
+
+    def update_search_vectors(self):
+        """
+        Rebuild the full-text search document of every hotel in the queryset.
+        Only PostgreSQL stores one; elsewhere this is a no-op.
+        """
+        from .search import search_vector, uses_postgres_search
+
+        if not uses_postgres_search():
+            return 0
+        return self.update(search_vector=search_vector())
+
+    def apply_review_change(self, rating_delta, count_delta=0):
+        """
+        Adjust the running review totals and guest score in a single atomic
+        UPDATE, without re-aggregating the hotel's reviews.
+        """
+        new_sum = F('review_rating_sum') + rating_delta
+        new_count = F('review_count') + count_delta
+        return self.update(
+            review_rating_sum=new_sum,
+            review_count=new_count,
+            guest_score=Case(
+                When(review_count__lte=-count_delta, then=Value(None)),
+                default=Cast(new_sum, FloatField()) / new_count,
+                output_field=FloatField(),
+            ),
+        )
+
+    def with_review_aggregates(self):
+        """
+        Annotate the review count, rating sum and average recomputed from
+        the reviews table.
+        """
+        from .models import Review
+
+        reviews = Review.objects.filter(hotel=OuterRef('pk')).order_by().values('hotel')
+        return self.annotate(
+            actual_review_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')), 0
+            ),
+            actual_rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0
+            ),
+            actual_guest_score=Subquery(reviews.annotate(average=Avg('rating')).values('average')),
+        )
+
+    def drifted(self):
+        """
+        Hotels whose stored review totals no longer match their reviews, or
+        whose guest score no longer matches the stored totals.
+        """
+        stored_average = Cast(F('review_rating_sum'), FloatField()) / F('review_count')
+        return self.with_review_aggregates().filter(
+            ~Q(review_count=F('actual_review_count'))
+            | ~Q(review_rating_sum=F('actual_rating_sum'))
+            | Q(review_count=0, guest_score__isnull=False)
+            | Q(review_count__gt=0, guest_score__isnull=True)
+            | (Q(review_count__gt=0) & ~Q(guest_score=stored_average))
+        )
+
+    def reconcile_review_totals(self):
+        """
+        Recompute review totals and guest scores from the reviews table
+        in one UPDATE statement.
+        """
+        aggregates = self.model.objects.with_review_aggregates().filter(pk=OuterRef('pk'))
+        return self.update(
+            review_count=Subquery(aggregates.values('actual_review_count')),
+            review_rating_sum=Subquery(aggregates.values('actual_rating_sum')),
+            guest_score=Subquery(aggregates.values('actual_guest_score')),
+        )
+
+
+class Nights(Func):
+    """
+    Whole days between two date expressions (end, start).
+    """
+    arity = 2
+    output_field = IntegerField()
+    # PostgreSQL subtracts dates into an integer number of days
+    template = '(%(expressions)s)'
+    arg_joiner = ' - '
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(julianday(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - julianday(',
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='DATEDIFF', template='%(function)s(%(expressions)s)',
+                           arg_joiner=', ', **extra_context)
+
+
+class BookingQuerySet(models.QuerySet):
+    def with_details(self, room_images=True):
+        """
+        Load the room, hotel, guest and room images BookingSerializer reads,
+        and compute the total price in SQL, so serializing any number of
+        bookings costs a constant number of queries. Compact representations
+        don't show room images, so they can skip their prefetch.
+        """
+        queryset = self.select_related('room__hotel', 'user').with_total_price()
+        if room_images:
+            queryset = queryset.prefetch_related('room__images')
+        return queryset
+
+    def with_total_price(self):
+        return self.annotate(
+            total_price=ExpressionWrapper(
+                F('room__price') * Nights('end_date', 'start_date'),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            )
+        )
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+from datetime import timedelta
+
+
+def index_existing_bookings(apps, schema_editor):
+    Booking = apps.get_model('hotels', 'Booking')
+    RoomNight = apps.get_model('hotels', 'RoomNight')
+    nights = []
+    for booking in Booking.objects.exclude(status='cancelled').iterator():
+        for offset in range((booking.end_date - booking.start_date).days):
+            nights.append(RoomNight(
+                room_id=booking.room_id,
+                booking_id=booking.pk,
+                night=booking.start_date + timedelta(days=offset),
+            ))
+    RoomNight.objects.bulk_create(nights, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0015_alter_hotelimage_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_nights', to='hotels.booking')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_nights', to='hotels.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['night', 'room'], name='hotels_roomnight_night_room'), models.Index(fields=['room', 'night'], name='hotels_roomnight_room_night')],
+                'unique_together': {('booking', 'night')},
+            },
+        ),
+        migrations.RunPython(index_existing_bookings, reverse_code=migrations.RunPython.noop),
+    ]
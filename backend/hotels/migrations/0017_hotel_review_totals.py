@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:44
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def backfill_review_totals(apps, schema_editor):
+    Hotel = apps.get_model('hotels', 'Hotel')
+    for hotel in Hotel.objects.annotate(
+        total_reviews=Count('reviews'),
+        total_rating=Sum('reviews__rating'),
+        average_rating=Avg('reviews__rating'),
+    ).iterator():
+        Hotel.objects.filter(pk=hotel.pk).update(
+            review_count=hotel.total_reviews,
+            review_rating_sum=hotel.total_rating or 0,
+            guest_score=hotel.average_rating,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0016_roomnight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotel',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='review_rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_totals, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0017_hotel_review_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotelimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='roomimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:57
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# GIN indexes only exist on PostgreSQL, so they are created here rather
+# than declared in Meta.indexes where SQLite would try to build them too.
+SEARCH_INDEXES = {
+    'hotels_hotel_search_gin': 'USING gin (search_vector)',
+    # Backs trigram word similarity (%>) on the address
+    'hotels_hotel_address_trgm': 'USING gin (address gin_trgm_ops)',
+    # Backs address__icontains, which compiles to UPPER(address::text) LIKE ...
+    'hotels_hotel_address_upper_trgm': 'USING gin (UPPER(address::text) gin_trgm_ops)',
+}
+
+POPULATE_SEARCH_VECTORS = """
+UPDATE hotels_hotel SET search_vector =
+    setweight(to_tsvector('simple', COALESCE(name, '')), 'A')
+    || setweight(to_tsvector('simple', COALESCE(address, '')), 'B')
+    || setweight(to_tsvector('simple', COALESCE(description, '')), 'C')
+    || setweight(to_tsvector('simple', COALESCE((
+        SELECT string_agg(feature.name, ' ')
+        FROM hotels_hotel_features hotel_feature
+        JOIN hotels_feature feature ON feature.id = hotel_feature.feature_id
+        WHERE hotel_feature.hotel_id = hotels_hotel.id
+    ), '')), 'D')
+"""
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, definition in SEARCH_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON hotels_hotel {definition}')
+    schema_editor.execute(POPULATE_SEARCH_VECTORS)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0018_image_renditions'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='hotel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, reverse_code=drop_search_indexes),
+    ]
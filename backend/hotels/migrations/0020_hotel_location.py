@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:59
+
+from django.db import migrations, models
+import django.db.models.functions.text
+import re
+
+
+def parse_existing_addresses(apps, schema_editor):
+    # Same rule as hotels.locations.parse_address at the time of writing
+    Hotel = apps.get_model('hotels', 'Hotel')
+    postal_code = re.compile(r'\b\d{3,}\b')
+    hotels = []
+    for hotel in Hotel.objects.only('id', 'address').iterator():
+        parts = [part.strip() for part in (hotel.address or '').split(',') if part.strip()]
+        if len(parts) < 2:
+            continue
+        hotel.city = ' '.join(postal_code.sub('', parts[-2]).split())[:100]
+        hotel.country = ' '.join(postal_code.sub('', parts[-1]).split())[:100]
+        hotels.append(hotel)
+    Hotel.objects.bulk_update(hotels, ['city', 'country'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0019_hotel_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotel',
+            name='city',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='country',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(django.db.models.functions.text.Upper('city'), name='hotels_hotel_city_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['country', 'city'], name='hotels_hotel_country_city'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['latitude', 'longitude'], name='hotels_hotel_lat_lon'),
+        ),
+        migrations.RunPython(parse_existing_addresses, reverse_code=migrations.RunPython.noop),
+    ]
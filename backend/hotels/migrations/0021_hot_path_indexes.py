@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0020_hotel_location'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', 'start_date', 'end_date'], name='hotels_booking_room_dates'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=['room', 'start_date', 'end_date'], name='hotels_booking_active_dates'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'start_date'], name='hotels_booking_status_start'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['id'], name='hotels_hotel_approved_id'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['hotel', 'bed_count', 'max_adults'], name='hotels_room_hotel_capacity'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0022_booking_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['price_per_night', 'id'], name='hotels_hotel_approved_price'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['stars', 'id'], name='hotels_hotel_approved_stars'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['guest_score', 'id'], name='hotels_hotel_approved_score'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['distance_to_center', 'id'], name='hotels_hotel_approved_distance'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:35
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0023_hotel_ranking_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='hotel',
+            name='hotels_hotel_approved_price',
+        ),
+        migrations.RemoveIndex(
+            model_name='hotel',
+            name='hotels_hotel_approved_score',
+        ),
+        migrations.RemoveIndex(
+            model_name='hotel',
+            name='hotels_hotel_approved_distance',
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(django.db.models.functions.comparison.Coalesce(models.F('price_per_night'), models.Value(Decimal('99999999.99'))), models.F('id'), condition=models.Q(('is_approved', True)), name='hotels_hotel_approved_price'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(django.db.models.functions.comparison.Coalesce(models.F('guest_score'), models.Value(-1.0)), models.F('id'), condition=models.Q(('is_approved', True)), name='hotels_hotel_approved_score'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(django.db.models.functions.comparison.Coalesce(models.F('distance_to_center'), models.Value(1000000000.0)), models.F('id'), condition=models.Q(('is_approved', True)), name='hotels_hotel_approved_distance'),
+        ),
+    ]
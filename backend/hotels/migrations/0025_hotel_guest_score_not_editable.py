@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0024_hotel_ranking_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hotel',
+            name='guest_score',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+    ]
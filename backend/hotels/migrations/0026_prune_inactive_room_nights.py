@@ -0,0 +1,21 @@
+from django.db import migrations
+
+# Booking.ACTIVE_STATUSES when this migration was written
+ACTIVE_STATUSES = ('pending', 'confirmed')
+
+
+def prune_inactive_room_nights(apps, schema_editor):
+    # 0016 indexed completed bookings too; only active ones hold their nights
+    RoomNight = apps.get_model('hotels', 'RoomNight')
+    RoomNight.objects.exclude(booking__status__in=ACTIVE_STATUSES).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0025_hotel_guest_score_not_editable'),
+    ]
+
+    operations = [
+        migrations.RunPython(prune_inactive_room_nights, reverse_code=migrations.RunPython.noop),
+    ]
@@ -1,6 +1,12 @@
+from datetime import timedelta
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 from .choices import RoomType
+from django.contrib.postgres.search import SearchVectorField
+from .managers import BookingQuerySet, HotelQuerySet, ranking_key
+from .uploads import clean_filename
+from .locations import parse_address
 
 
 class Feature(models.Model):
@@ -64,6 +70,25 @@ class Hotel(models.Model):
         blank=True,
     )
     address = models.TextField()
+    # Parsed from the address on save; see hotels.locations
+    city = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+    )
+    country = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+    )
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+    )
+    longitude = models.FloatField(
+        blank=True,
+        null=True,
+    )
     website = models.URLField(
         blank=True,
         null=True,
@@ -72,9 +97,25 @@ class Hotel(models.Model):
         blank=True,
         null=True,
     )
+    # Review totals are only written with F() expressions by the review
+    # signals; see Hotel.save and HotelQuerySet.apply_review_change
     guest_score = models.FloatField(
         blank=True,
         null=True,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    review_rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    # Maintained by signals on PostgreSQL; see hotels.search
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
     )
     distance_to_center = models.FloatField(
         blank=True,
@@ -102,16 +143,65 @@ class Hotel(models.Model):
         null=True,
     )
 
+    objects = HotelQuerySet.as_manager()
+
+    REVIEW_TOTAL_FIELDS = frozenset({'guest_score', 'review_count', 'review_rating_sum'})
+
+    class Meta:
+        indexes = [
+            # Serves city__iexact, which compares UPPER(city)
+            models.Index(Upper('city'), name='hotels_hotel_city_upper'),
+            models.Index(fields=['country', 'city'], name='hotels_hotel_country_city'),
+            # Bounding-box prefilter of radius searches
+            models.Index(fields=['latitude', 'longitude'], name='hotels_hotel_lat_lon'),
+            # Public listings: approved hotels in cursor (id) order
+            models.Index(fields=['id'], condition=models.Q(is_approved=True), name='hotels_hotel_approved_id'),
+            # Ranked listings in their common directions: cheapest, most
+            # stars, best rated and closest first; see HotelQuerySet.ranked_by
+            models.Index(ranking_key('price_per_night'), models.F('id'), condition=models.Q(is_approved=True), name='hotels_hotel_approved_price'),
+            models.Index(fields=['stars', 'id'], condition=models.Q(is_approved=True), name='hotels_hotel_approved_stars'),
+            models.Index(ranking_key('guest_score', descending=True), models.F('id'), condition=models.Q(is_approved=True), name='hotels_hotel_approved_score'),
+            models.Index(ranking_key('distance_to_center'), models.F('id'), condition=models.Q(is_approved=True), name='hotels_hotel_approved_distance'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored location so save() can tell when to re-derive it
+        instance._loaded_location = {
+            name: value for name, value in zip(field_names, values) if name in ('address', 'city')
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            # Writing back the review totals this instance loaded would
+            # erase reviews counted since, so full saves leave them alone
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.REVIEW_TOTAL_FIELDS
+            ]
+        loaded = getattr(self, '_loaded_location', {})
+        address_changed = 'address' in loaded and loaded['address'] != self.address
+        city_changed = 'city' in loaded and loaded['city'] != self.city
+        if self.address and (not self.city or (address_changed and not city_changed)):
+            self.city, self.country = parse_address(self.address)
+            if address_changed:
+                # Coordinates of the old address no longer apply
+                self.latitude = self.longitude = None
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'city', 'country', 'latitude', 'longitude'}
+        super().save(*args, **kwargs)
+        self._loaded_location = {'address': self.address, 'city': self.city}
+
     def update_average_price(self):
         """
         Calculate and update the average price per night based on all rooms
         """
-        rooms = self.rooms.all()
-        if rooms:
-            avg_price = sum(room.price for room in rooms) / len(rooms)
-            self.price_per_night = avg_price
-        else:
-            self.price_per_night = None
+        self.price_per_night = self.rooms.aggregate(
+            avg_price=models.Avg('price')
+        )['avg_price']
         self.save(update_fields=['price_per_night'])
 
     def __str__(self):
@@ -128,19 +218,15 @@ class HotelImage(models.Model):
         upload_to='hotel_images/',
         max_length=500,  # Increased max length for S3 URLs
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"Image for {self.hotel.name}"
 
     def save(self, *args, **kwargs):
-        if self.image:
-            # Clean the filename to prevent issues
-            import os
-            from django.utils.text import slugify
-            filename = os.path.basename(self.image.name)
-            name, ext = os.path.splitext(filename)
-            clean_name = slugify(name)
-            self.image.name = f"hotel_images/{clean_name}{ext}"
+        if self.image and not self.image._committed:
+            # Clean the filename to prevent issues; upload_to adds the folder
+            self.image.name = clean_filename(self.image.name)
         super().save(*args, **kwargs)
 
 
@@ -170,13 +256,20 @@ class Room(models.Model):
         default=RoomType.SINGLE,
     )
 
+    class Meta:
+        indexes = [
+            # Capacity filters of a hotel's rooms
+            models.Index(fields=['hotel', 'bed_count', 'max_adults'], name='hotels_room_hotel_capacity'),
+        ]
+
     def is_available(self, start_date, end_date, booking_id=None):
         """
         Check if the room is available for a given date range,
         optionally excluding a specific booking.
         """
-        # Check for any bookings that overlap with the desired date range
+        # Check for any live bookings that overlap with the desired date range
         overlapping_bookings = self.bookings.filter(
+            status__in=Booking.ACTIVE_STATUSES,
             start_date__lt=end_date,
             end_date__gt=start_date,
         )
@@ -203,6 +296,11 @@ class Booking(models.Model):
     """
     Model to store booking information for a room.
     """
+    # Statuses that hold the room; cancelled and completed bookings don't
+    ACTIVE_STATUSES = ('pending', 'confirmed')
+    # Statuses moved to BookingArchive by the archive_bookings command
+    ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+
     room = models.ForeignKey(
         Room,
         related_name='bookings',
@@ -226,10 +324,140 @@ class Booking(models.Model):
         default='pending'
     )
 
+    objects = BookingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Overlap checks only consider bookings that still hold the room
+            models.Index(
+                fields=['room', 'start_date', 'end_date'],
+                condition=models.Q(status__in=['pending', 'confirmed']),
+                name='hotels_booking_active_dates',
+            ),
+            # Status counts and filters in the dashboard and admin
+            models.Index(fields=['status', 'start_date'], name='hotels_booking_status_start'),
+        ]
+
+    def nights(self):
+        """
+        Return the dates of every night covered by this booking
+        (the check-out day is not included).
+        """
+        return [
+            self.start_date + timedelta(days=offset)
+            for offset in range((self.end_date - self.start_date).days)
+        ]
+
+    def update_room_nights(self):
+        """
+        Refresh this booking's rows in the room-night availability index
+        """
+        RoomNight.rebuild([self])
+
     def __str__(self):
         return f"Booking for {self.room} from {self.start_date} to {self.end_date}"
 
 
+class RoomNight(models.Model):
+    """
+    Availability index with one row per room per booked night.
+    Kept in sync with Booking writes so searches can filter rooms with an
+    indexed range lookup instead of scanning every booking.
+    """
+    room = models.ForeignKey(
+        Room,
+        related_name='booked_nights',
+        on_delete=models.CASCADE
+    )
+    booking = models.ForeignKey(
+        Booking,
+        related_name='room_nights',
+        on_delete=models.CASCADE
+    )
+    night = models.DateField()
+
+    class Meta:
+        unique_together = ('booking', 'night')
+        indexes = [
+            models.Index(fields=['night', 'room'], name='hotels_roomnight_night_room'),
+            models.Index(fields=['room', 'night'], name='hotels_roomnight_room_night'),
+        ]
+
+    @classmethod
+    def rebuild(cls, bookings):
+        """
+        Replace the index rows of the given bookings. Only active bookings
+        occupy their room; the others end up without any rows.
+        """
+        bookings = list(bookings)
+        cls.objects.filter(booking__in=[booking.pk for booking in bookings]).delete()
+        cls.objects.bulk_create(
+            [
+                cls(room_id=booking.room_id, booking_id=booking.pk, night=night)
+                for booking in bookings
+                if booking.status in Booking.ACTIVE_STATUSES
+                for night in booking.nights()
+            ],
+            batch_size=1000,
+        )
+
+    def __str__(self):
+        return f"{self.room} booked on {self.night}"
+
+
+class BookingArchive(models.Model):
+    """
+    Completed and cancelled bookings moved out of the Booking table by the
+    archive_bookings command, so overlap checks only scan live rows.
+    """
+    booking_id = models.BigIntegerField(
+        unique=True,
+    )
+    room = models.ForeignKey(
+        Room,
+        related_name='archived_bookings',
+        on_delete=models.SET_NULL,
+        null=True,
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='archived_bookings',
+        on_delete=models.CASCADE
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    status = models.CharField(
+        max_length=20,
+    )
+    total_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        blank=True,
+        null=True,
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def from_booking(cls, booking):
+        """
+        Build the archive row of a booking, keeping the price it was charged
+        at in case the room's price changes or the room is deleted later.
+        """
+        nights = (booking.end_date - booking.start_date).days
+        return cls(
+            booking_id=booking.pk,
+            room_id=booking.room_id,
+            user_id=booking.user_id,
+            start_date=booking.start_date,
+            end_date=booking.end_date,
+            status=booking.status,
+            total_price=booking.room.price * nights,
+        )
+
+    def __str__(self):
+        return f"Archived booking {self.booking_id} from {self.start_date} to {self.end_date}"
+
+
 class RoomImage(models.Model):
     room = models.ForeignKey(
         Room,
@@ -239,6 +467,7 @@ class RoomImage(models.Model):
     image = models.ImageField(
         upload_to='room_images/',
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"Image for {self.room}"
@@ -300,5 +529,12 @@ class Review(models.Model):
         unique_together = ('hotel', 'user')
         ordering = ['-created_at']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so signals can apply rating deltas
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def __str__(self):
         return f"Review by {self.user.username} for {self.hotel.name}"
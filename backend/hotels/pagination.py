@@ -0,0 +1,34 @@
+from rest_framework.pagination import CursorPagination
+
+
+class HotelCursorPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination for hotel search results, ordered by id so
+    pages stay stable while hotels are added or approved.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Keep an ordering the view already applied, such as search rank,
+        with id appended as the tie-breaker.
+        """
+        ordering = tuple(queryset.query.order_by)
+        if not ordering:
+            return super().get_ordering(request, queryset, view)
+        if 'id' not in ordering and '-id' not in ordering:
+            ordering += ('id',)
+        return ordering
+
+
+class BookingCursorPagination(CursorPagination):
+    """
+    Cursor pagination for a hotel's bookings, newest stays first.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-start_date', '-id')
@@ -0,0 +1,102 @@
+"""
+Server-side filtering and ordering of hotel search results.
+
+Range filters and the amenity filter narrow the listing in SQL, and the
+requested sort order is applied before pagination so only the top results
+are sent. The common sort orders are backed by partial (key, id) indexes
+on approved hotels; see Hotel.Meta.indexes.
+"""
+import math
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count
+
+from .features import clean_feature_names, feature_catalog
+from .models import Feature, Hotel
+
+# Public sort keys and the hotel fields they order by
+SORT_FIELDS = {
+    'price': 'price_per_night',
+    'stars': 'stars',
+    'score': 'guest_score',
+    'distance': 'distance_to_center',
+}
+
+# Query parameter: (field lookup, value parser)
+RANGE_FILTERS = {
+    'price_min': ('price_per_night__gte', Decimal),
+    'price_max': ('price_per_night__lte', Decimal),
+    'stars_min': ('stars__gte', int),
+    'stars_max': ('stars__lte', int),
+    'score_min': ('guest_score__gte', float),
+    'distance_max': ('distance_to_center__lte', float),
+}
+
+MAX_AMENITIES = 20
+
+
+def filter_ranges(queryset, query_params):
+    """
+    Apply the RANGE_FILTERS present in the query. Malformed values are
+    ignored, like the other search parameters.
+    """
+    for param, (lookup, parse) in RANGE_FILTERS.items():
+        value = query_params.get(param, '').strip()
+        if not value:
+            continue
+        try:
+            parsed = parse(value)
+            if not math.isfinite(parsed):
+                continue
+        except (ValueError, InvalidOperation):
+            continue
+        queryset = queryset.filter(**{lookup: parsed})
+    return queryset
+
+
+def amenity_ids(names):
+    """
+    Ids of the amenities with the given names, read from the feature
+    catalog. Names missing from it are looked up once in the database
+    rather than invalidating the catalog for arbitrary input.
+    """
+    known = {name: feature_id for feature_id, (name, is_amenity) in feature_catalog().items() if is_amenity}
+    ids = {name: known[name] for name in names if name in known}
+    missing = [name for name in names if name not in ids]
+    if missing:
+        ids.update(Feature.objects.filter(name__in=missing, is_amenity=True).values_list('name', 'id'))
+    return ids
+
+
+def filter_amenities(queryset, value):
+    """
+    Hotels having every amenity in the comma-separated `value`.
+    """
+    names = clean_feature_names(value)[:MAX_AMENITIES]
+    if not names:
+        return queryset
+    ids = amenity_ids(names)
+    if len(ids) < len(names):
+        # An unknown amenity can't be matched by any hotel
+        return queryset.none()
+    matching = (
+        Hotel.features.through.objects
+        .filter(feature_id__in=ids.values())
+        .values('hotel_id')
+        .annotate(matched=Count('feature_id'))
+        .filter(matched=len(ids))
+        .values('hotel_id')
+    )
+    return queryset.filter(id__in=matching)
+
+
+def order_hotels(queryset, ordering):
+    """
+    Order hotels by a SORT_FIELDS key, descending with a leading '-'.
+    Hotels without a value for the field are kept and listed last.
+    """
+    key = ordering.strip()
+    field = SORT_FIELDS.get(key.lstrip('-'))
+    if field is None:
+        return queryset
+    return queryset.ranked_by(field, descending=key.startswith('-'))
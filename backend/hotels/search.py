@@ -0,0 +1,79 @@
+"""
+Hotel search. On PostgreSQL, `q` runs against a weighted full-text vector
+(name, address, description and feature names) with ranking, and city
+matching is typo tolerant via trigram word similarity; both are backed by
+GIN indexes. Other databases fall back to case-insensitive substring
+matching so development and tests work on SQLite.
+"""
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+# 'simple' avoids English stemming of Bulgarian place and hotel names
+SEARCH_CONFIG = 'simple'
+# Fields the search vector is built from; saving any other field skips the rebuild
+SEARCH_FIELDS = {'name', 'address', 'description'}
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def search_vector():
+    """
+    Weighted document for each hotel, including the names of its features.
+    """
+    from .models import Hotel
+
+    feature_names = (
+        Hotel.features.through.objects
+        .filter(hotel=OuterRef('pk'))
+        .order_by()
+        .values('hotel')
+        .annotate(names=StringAgg('feature__name', ' '))
+        .values('names')
+    )
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('address', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        + SearchVector(Coalesce(Subquery(feature_names), Value('')), weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def search(queryset, q):
+    """
+    Hotels matching the free-text query `q`, best matches first.
+    """
+    if uses_postgres_search():
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        # Rounded to a decimal so the value survives the pagination cursor
+        rank = Cast(SearchRank(F('search_vector'), query), DecimalField(max_digits=12, decimal_places=6))
+        return (
+            queryset
+            .filter(search_vector=query)
+            .annotate(search_rank=rank)
+            .order_by('-search_rank', 'id')
+        )
+
+    for term in q.split():
+        queryset = queryset.filter(
+            Q(name__icontains=term)
+            | Q(address__icontains=term)
+            | Q(description__icontains=term)
+            | Q(features__name__icontains=term)
+        )
+    return queryset
+
+
+def filter_city(queryset, city):
+    """
+    Hotels whose address mentions `city`, tolerating small typos on PostgreSQL.
+    """
+    if uses_postgres_search():
+        return queryset.filter(
+            Q(address__icontains=city) | Q(address__trigram_word_similar=city)
+        )
+    return queryset.filter(address__icontains=city)
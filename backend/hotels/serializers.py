@@ -3,6 +3,8 @@ from rest_framework import serializers
 from .models import Hotel, HotelImage, Room, Booking, RoomImage, FavoriteHotel, Review, Feature
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
+from .images import rendition_urls
+from .features import split_features
 
 User = get_user_model()
 
@@ -28,15 +30,26 @@ class AmenitiesField(serializers.Field):
             return ','.join(str(item) for item in data)
         return str(data)
 
-class ImageSerializer(serializers.ModelSerializer):
+class RenditionsMixin:
+    """
+    Adds the thumbnail, card and full-size URLs of an image model.
+    """
+    def get_renditions(self, obj):
+        return rendition_urls(obj.image, obj.renditions, self.context.get('request'))
+
+class ImageSerializer(RenditionsMixin, serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = HotelImage
-        fields = ('id', 'image')
+        fields = ('id', 'image', 'renditions')
+
+class RoomImageSerializer(RenditionsMixin, serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
 
-class RoomImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = RoomImage
-        fields = ('id', 'image')
+        fields = ('id', 'image', 'renditions')
 
 class RoomSerializer(serializers.ModelSerializer):
     images = RoomImageSerializer(many=True, read_only=True)
@@ -84,7 +97,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
 class HotelSerializer(serializers.ModelSerializer):
     images = serializers.SerializerMethodField()
-    features = FeatureSerializer(many=True, read_only=True)
+    features = serializers.SerializerMethodField()
     amenities = serializers.SerializerMethodField()
     rooms = RoomSerializer(many=True, read_only=True)
     photo_url = serializers.SerializerMethodField()
@@ -96,7 +109,7 @@ class HotelSerializer(serializers.ModelSerializer):
             'availability_end_date', 'features', 'amenities', 'address', 'website',
             'description', 'guest_score', 'distance_to_center', 'contact_phone',
             'contact_email', 'number_of_adults', 'check_in_time', 'check_out_time',
-            'images', 'rooms', 'photo_url'
+            'images', 'rooms', 'photo_url', 'city', 'country', 'latitude', 'longitude'
         ]
 
     def get_images(self, obj):
@@ -104,7 +117,8 @@ class HotelSerializer(serializers.ModelSerializer):
             request = self.context.get('request')
             return [{
                 'id': img.id,
-                'image': request.build_absolute_uri(img.image.url) if request else img.image.url
+                'image': request.build_absolute_uri(img.image.url) if request else img.image.url,
+                'renditions': rendition_urls(img.image, img.renditions, request),
             } for img in obj.images.all()]
         except Exception as e:
             import logging
@@ -114,35 +128,74 @@ class HotelSerializer(serializers.ModelSerializer):
 
     def get_photo_url(self, obj):
         try:
-            if obj.images.exists():
-                request = self.context.get('request')
-                image = obj.images.first()
-                if request and image:
-                    return request.build_absolute_uri(image.image.url)
-                elif image:
-                    return image.image.url
+            images = obj.images.all()
+            if images:
+                image = images[0]
+                return rendition_urls(image.image, image.renditions, self.context.get('request'))['full']
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Error getting hotel photo URL: {str(e)}")
         return None
 
+    def split_features(self, obj):
+        # Names come from the feature catalog; only the prefetched ids are
+        # read, once per hotel for both fields
+        if not hasattr(obj, '_split_features'):
+            obj._split_features = split_features([feature.id for feature in obj.features.all()])
+        return obj._split_features
+
+    def get_features(self, obj):
+        return self.split_features(obj)[0]
+
     def get_amenities(self, obj):
-        return [
-            feature.name for feature in obj.features.filter(is_amenity=True)
-        ]
+        return self.split_features(obj)[1]
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        # Convert features to just a list of feature names (non-amenities)
-        data['features'] = [
-            feature['name'] 
-            for feature in data['features'] 
-            if not feature['is_amenity']
+class HotelListSerializer(serializers.ModelSerializer):
+    """
+    Lightweight hotel representation used for search result listings.
+    """
+    photo_url = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Hotel
+        fields = [
+            'id', 'name', 'address', 'city', 'country', 'stars', 'price_per_night',
+            'guest_score', 'review_count', 'distance_to_center', 'photo_url', 'distance_km'
         ]
-        return data
+
+    def get_distance_km(self, obj):
+        # Only annotated by radius searches
+        distance = getattr(obj, 'distance_km', None)
+        return float(distance) if distance is not None else None
+
+    def get_photo_url(self, obj):
+        images = obj.images.all()
+        if not images:
+            return None
+        image = images[0]
+        return rendition_urls(image.image, image.renditions, self.context.get('request'))['card']
+
+class BookingRoomSummarySerializer(serializers.ModelSerializer):
+    """
+    Room fields of a booking in compact mode, without the room's images.
+    """
+    hotel_name = serializers.CharField(source='hotel.name', read_only=True)
+    hotel_address = serializers.CharField(source='hotel.address', read_only=True)
+    hotel_id = serializers.IntegerField(source='hotel.id', read_only=True)
+
+    class Meta:
+        model = Room
+        fields = ('id', 'price', 'room_type', 'hotel_name', 'hotel_address', 'hotel_id')
+
 
 class BookingSerializer(serializers.ModelSerializer):
+    """
+    Reads the room, hotel, guest and total price loaded by
+    Booking.objects.with_details(). With `compact` set in the context the
+    room is reduced to a summary.
+    """
     total_price = serializers.SerializerMethodField()
 
     class Meta:
@@ -151,6 +204,8 @@ class BookingSerializer(serializers.ModelSerializer):
         read_only_fields = ('user',)
 
     def get_total_price(self, obj):
+        if hasattr(obj, 'total_price'):
+            return obj.total_price if obj.total_price and obj.total_price > 0 else 0
         if obj.start_date and obj.end_date and obj.room and obj.room.price:
             num_nights = (obj.end_date - obj.start_date).days
             if num_nights > 0:
@@ -159,16 +214,19 @@ class BookingSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
+        representation['user'] = ReviewUserSerializer(instance.user).data
         if instance.room:
-            representation['room'] = RoomSerializer(instance.room).data
+            room_serializer = BookingRoomSummarySerializer if self.context.get('compact') else RoomSerializer
+            representation['room'] = room_serializer(instance.room, context=self.context).data
         return representation
 
 
 class FavoriteHotelSerializer(serializers.ModelSerializer):
     """
-    Serializer for the FavoriteHotel model.
+    Serializer for the FavoriteHotel model. Hotels are shown as the same
+    compact cards as search results.
     """
-    hotel = HotelSerializer(read_only=True)
+    hotel = HotelListSerializer(read_only=True)
     hotel_id = serializers.PrimaryKeyRelatedField(
         queryset=Hotel.objects.all(),
         write_only=True,
@@ -178,4 +236,19 @@ class FavoriteHotelSerializer(serializers.ModelSerializer):
     class Meta:
         model = FavoriteHotel
         fields = ('id', 'user', 'hotel', 'hotel_id', 'created_at')
-        read_only_fields = ('user', 'created_at')
\ No newline at end of file
+        read_only_fields = ('user', 'created_at')
+
+
+class FavoriteBulkSerializer(serializers.Serializer):
+    """
+    Hotel ids to add to and remove from the user's favorites in one request.
+    """
+    add = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=200)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=200)
+
+    def validate(self, data):
+        if not data['add'] and not data['remove']:
+            raise serializers.ValidationError("Provide hotel ids to add or remove.")
+        if set(data['add']) & set(data['remove']):
+            raise serializers.ValidationError("A hotel can't be both added and removed.")
+        return data
@@ -1,19 +1,142 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db import transaction
 from django.dispatch import receiver
-from django.db.models import Avg
-from .models import Review, Hotel
+from .models import Review, Hotel, Booking, Room, HotelImage, RoomImage, Feature
+from . import cache as search_cache
+from .images import delete_renditions
+from .tasks import schedule_renditions
+from .search import SEARCH_FIELDS
+from . import features as feature_catalog
 
-@receiver([post_save, post_delete], sender=Review)
-def update_hotel_rating(sender, instance, **kwargs):
+@receiver(post_save, sender=Review)
+def update_hotel_rating(sender, instance, created, **kwargs):
+    """
+    Updates the hotel's running review totals and guest score whenever a
+    review is saved, applying only the change in rating.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    previous_hotel_id = loaded.get('hotel_id', instance.hotel_id)
+    previous_rating = loaded.get('rating')
+
+    if created:
+        Hotel.objects.filter(pk=instance.hotel_id).apply_review_change(instance.rating, 1)
+    elif previous_rating is None:
+        # The previous rating is unknown, so fall back to a full recount
+        Hotel.objects.filter(pk=instance.hotel_id).reconcile_review_totals()
+    elif previous_hotel_id != instance.hotel_id:
+        Hotel.objects.filter(pk=previous_hotel_id).apply_review_change(-previous_rating, -1)
+        Hotel.objects.filter(pk=instance.hotel_id).apply_review_change(instance.rating, 1)
+    elif previous_rating != instance.rating:
+        Hotel.objects.filter(pk=instance.hotel_id).apply_review_change(instance.rating - previous_rating)
+
+    instance._loaded_values = {'hotel_id': instance.hotel_id, 'rating': instance.rating}
+
+
+@receiver(post_delete, sender=Review)
+def remove_hotel_rating(sender, instance, **kwargs):
+    """
+    Removes a deleted review from the hotel's running review totals.
+    """
+    Hotel.objects.filter(pk=instance.hotel_id).apply_review_change(-instance.rating, -1)
+
+
+@receiver(post_save, sender=Booking)
+def update_booking_room_nights(sender, instance, **kwargs):
+    """
+    Keeps the room-night availability index in sync whenever a booking is
+    created, rescheduled or has its status changed.
+    """
+    instance.update_room_nights()
+
+
+@receiver(post_save, sender=Hotel)
+def update_hotel_search_vector(sender, instance, update_fields=None, **kwargs):
+    """
+    Rebuilds the hotel's full-text search document when a searched field changes.
+    """
+    if update_fields is None or SEARCH_FIELDS.intersection(update_fields):
+        Hotel.objects.filter(pk=instance.pk).update_search_vectors()
+
+
+@receiver(post_save, sender=Feature)
+def update_feature_search_vectors(sender, instance, created, **kwargs):
+    """
+    Rebuilds the search documents of every hotel listing a renamed feature.
+    """
+    if not created:
+        Hotel.objects.filter(features=instance).update_search_vectors()
+
+
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+def forget_feature_ids(sender, instance, created=False, **kwargs):
     """
-    Updates the hotel's average guest score whenever a review is saved or deleted.
+    Drops cached feature ids that a rename or delete may have made stale.
     """
-    hotel = instance.hotel
-    average_rating = hotel.reviews.aggregate(Avg('rating'))['rating__avg']
-    
-    if average_rating is not None:
-        hotel.guest_score = average_rating
+    if created:
+        return
+    if kwargs.get('signal') is post_delete:
+        feature_catalog.forget_feature(instance.name)
     else:
-        hotel.guest_score = None
-        
-    hotel.save() 
\ No newline at end of file
+        # The previous name of a renamed feature isn't known here
+        feature_catalog.clear_feature_cache()
+
+
+@receiver([post_save, post_delete], sender=Feature)
+def invalidate_feature_catalog(sender, **kwargs):
+    """
+    Makes every worker reload the feature catalog after a feature changes.
+    """
+    feature_catalog.invalidate_catalog()
+    # Another worker may reload before this transaction commits and cache
+    # the old rows under the new version, so bump it again afterwards
+    transaction.on_commit(feature_catalog.invalidate_catalog)
+
+
+@receiver(m2m_changed, sender=Hotel.features.through)
+def update_hotel_features_search_vector(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Rebuilds search documents when features are added to or removed from hotels.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        Hotel.objects.filter(pk=instance.pk).update_search_vectors()
+    elif pk_set:
+        Hotel.objects.filter(pk__in=pk_set).update_search_vectors()
+
+
+@receiver(post_save, sender=HotelImage)
+@receiver(post_save, sender=RoomImage)
+def queue_image_renditions(sender, instance, **kwargs):
+    """
+    Generates resized renditions of new or replaced images in a worker.
+    """
+    schedule_renditions(instance)
+
+
+@receiver(post_delete, sender=HotelImage)
+@receiver(post_delete, sender=RoomImage)
+def remove_image_renditions(sender, instance, **kwargs):
+    """
+    Deletes the rendition files of a removed image.
+    """
+    delete_renditions(instance.image.storage, instance.renditions)
+
+
+@receiver([post_save, post_delete], sender=Hotel)
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=Booking)
+@receiver([post_save, post_delete], sender=HotelImage)
+@receiver([post_save, post_delete], sender=RoomImage)
+@receiver([post_save, post_delete], sender=Feature)
+@receiver([post_save, post_delete], sender=Review)
+@receiver(m2m_changed, sender=Hotel.features.through)
+def invalidate_hotel_search_cache(sender, **kwargs):
+    """
+    Drops cached search responses whenever data they contain changes.
+    """
+    search_cache.invalidate()
+    # A concurrent request may read the old rows before this transaction
+    # commits and cache them under the new generation; drop those as well
+    transaction.on_commit(search_cache.invalidate)
@@ -0,0 +1,68 @@
+import logging
+from celery import shared_task
+from django.apps import apps
+from django.db import transaction
+from PIL import UnidentifiedImageError
+from .images import build_renditions, delete_renditions, renditions_are_current
+from . import cache as search_cache
+
+logger = logging.getLogger(__name__)
+
+# Image field and renditions field of every model that gets renditions
+RENDITION_FIELDS = {
+    'hotels.hotelimage': ('image', 'renditions'),
+    'hotels.roomimage': ('image', 'renditions'),
+    'accounts.userprofile': ('profile_picture', 'profile_picture_renditions'),
+}
+
+
+@shared_task(autoretry_for=(OSError,), retry_backoff=True, max_retries=3)
+def generate_renditions(model_label, pk):
+    """
+    Build the resized renditions of an uploaded image and record them on
+    its row, unless the image was replaced or deleted in the meantime.
+    """
+    model = apps.get_model(model_label)
+    image_field, renditions_field = RENDITION_FIELDS[model_label]
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return False
+    field_file = getattr(instance, image_field)
+    if not field_file or renditions_are_current(field_file, getattr(instance, renditions_field)):
+        return False
+
+    try:
+        renditions = build_renditions(field_file)
+    except UnidentifiedImageError:
+        logger.warning(f"Skipping renditions for {model_label} {pk}: not a readable image")
+        return False
+    # Written with update() so saving doesn't schedule another run
+    updated = model.objects.filter(pk=pk, **{image_field: field_file.name}).update(
+        **{renditions_field: renditions}
+    )
+    if not updated:
+        delete_renditions(field_file.storage, renditions)
+        return False
+    if model_label.startswith('hotels.'):
+        search_cache.invalidate()
+    return True
+
+
+def schedule_renditions(instance):
+    """
+    Enqueue rendition generation for `instance` once the current
+    transaction commits, if its image changed since the last run.
+    """
+    model_label = instance._meta.label_lower
+    image_field, renditions_field = RENDITION_FIELDS[model_label]
+    field_file = getattr(instance, image_field)
+    if not field_file or renditions_are_current(field_file, getattr(instance, renditions_field)):
+        return
+
+    def enqueue():
+        try:
+            generate_renditions.delay(model_label, instance.pk)
+        except Exception as e:
+            logger.error(f"Failed to enqueue renditions for {model_label} {instance.pk}: {str(e)}")
+
+    transaction.on_commit(enqueue)
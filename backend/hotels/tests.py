@@ -1,11 +1,33 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.core.cache import cache
+from io import BytesIO, StringIO
+import csv
+import json
+import shutil
+import time
+import tempfile
+from PIL import Image
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+import boto3
+from moto import mock_aws
 from django.contrib.auth import get_user_model
 from datetime import date, timedelta
-from .models import Hotel, Room, Booking, Review, Feature
+from .models import Hotel, Room, Booking, BookingArchive, Review, Feature, RoomNight, HotelImage, RoomImage, FavoriteHotel
 from .choices import RoomType
+from .benchmark import ENDPOINTS, seed_dataset, measure_endpoint
+from . import cache as search_cache
+from .tasks import generate_renditions
+from .uploads import bulk_create_images
+from .pagination import HotelCursorPagination
+from .locations import parse_address
+from .features import CATALOG_TTL, catalog_version, clear_feature_cache, feature_catalog, resolve_feature_ids, set_hotel_features, split_features
 
 User = get_user_model()
 
@@ -172,17 +194,17 @@ class HotelAPITests(APITestCase):
         """Test listing hotels"""
         response = self.client.get(self.hotels_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_search_hotels(self):
         """Test searching hotels"""
         response = self.client.get(f"{self.hotels_url}?city=Test")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
         response = self.client.get(f"{self.hotels_url}?city=NonExistent")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
 
     def test_hotel_detail(self):
         """Test retrieving hotel detail"""
@@ -251,3 +273,1617 @@ class BookingAPITests(APITestCase):
         }
         response = self.client.post(self.bookings_url, booking_data, format='json')  # Use format='json'
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AvailabilityIndexTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123'
+        )
+        self.hotel_user = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(
+            user=self.hotel_user,
+            name='Index Hotel',
+            stars=3,
+            address='1 Index St',
+            is_approved=True
+        )
+        self.room = Room.objects.create(
+            hotel=self.hotel,
+            price=100,
+            bed_count=2,
+            max_adults=2,
+            room_type=RoomType.DOUBLE
+        )
+        self.start_date = date.today() + timedelta(days=10)
+        self.end_date = self.start_date + timedelta(days=3)
+        self.booking = Booking.objects.create(
+            room=self.room,
+            user=self.user,
+            start_date=self.start_date,
+            end_date=self.end_date
+        )
+
+    def test_booking_creates_room_nights(self):
+        """Test that every booked night is indexed, excluding check-out day"""
+        nights = list(RoomNight.objects.filter(room=self.room).values_list('night', flat=True).order_by('night'))
+        self.assertEqual(nights, self.booking.nights())
+        self.assertEqual(len(nights), 3)
+
+    def test_reschedule_moves_room_nights(self):
+        """Test that changing the dates re-indexes the booking"""
+        self.booking.start_date = self.end_date
+        self.booking.end_date = self.end_date + timedelta(days=1)
+        self.booking.save()
+        nights = list(RoomNight.objects.filter(booking=self.booking).values_list('night', flat=True))
+        self.assertEqual(nights, [self.end_date])
+
+    def test_cancellation_frees_room_nights(self):
+        """Test that cancelled bookings are removed from the index"""
+        self.booking.status = 'cancelled'
+        self.booking.save()
+        self.assertFalse(RoomNight.objects.filter(booking=self.booking).exists())
+
+    def test_only_active_bookings_block_room(self):
+        """Test that cancelled and completed bookings don't make a room unavailable"""
+        self.assertFalse(self.room.is_available(self.start_date, self.end_date))
+        for booking_status in ('cancelled', 'completed'):
+            self.booking.status = booking_status
+            self.booking.save()
+            self.assertTrue(self.room.is_available(self.start_date, self.end_date))
+            self.assertFalse(RoomNight.objects.filter(booking=self.booking).exists())
+
+    def test_reactivating_booking_checks_availability(self):
+        """Test that a cancelled booking can't be confirmed once its room is taken"""
+        self.booking.status = 'cancelled'
+        self.booking.save()
+        Booking.objects.create(
+            room=self.room,
+            user=self.user,
+            start_date=self.start_date,
+            end_date=self.end_date
+        )
+        self.client.force_authenticate(user=self.hotel_user)
+        url = reverse('booking-detail', args=[self.booking.id])
+        response = self.client.patch(url, {'status': 'confirmed'})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, 'cancelled')
+
+    def test_search_uses_index(self):
+        """Test that date searches exclude hotels whose only room is booked"""
+        url = reverse('hotel-list')
+        overlapping = {
+            'check_in': (self.start_date + timedelta(days=1)).isoformat(),
+            'check_out': (self.end_date + timedelta(days=1)).isoformat(),
+        }
+        free = {
+            'check_in': self.end_date.isoformat(),
+            'check_out': (self.end_date + timedelta(days=2)).isoformat(),
+        }
+        self.assertEqual(len(self.client.get(url, overlapping).data['results']), 0)
+        self.assertEqual(len(self.client.get(url, free).data['results']), 1)
+
+
+class AvailabilityCalendarTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Test',
+            last_name='Guest',
+            password='testpass123'
+        )
+        owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(
+            user=owner,
+            name='Calendar Hotel',
+            stars=3,
+            address='1 Calendar St',
+            is_approved=True
+        )
+        self.rooms = [
+            Room.objects.create(
+                hotel=self.hotel,
+                price=100,
+                bed_count=2,
+                max_adults=2,
+                room_type=RoomType.DOUBLE
+            )
+            for _ in range(3)
+        ]
+        self.start_date = date.today() + timedelta(days=10)
+        self.url = reverse('hotel-availability', args=[self.hotel.id])
+        self.params = {
+            'from': self.start_date.isoformat(),
+            'to': (self.start_date + timedelta(days=5)).isoformat(),
+        }
+
+    def book(self, room, first_night, nights, booking_status='pending'):
+        start_date = self.start_date + timedelta(days=first_night)
+        return Booking.objects.create(
+            room=room,
+            user=self.user,
+            start_date=start_date,
+            end_date=start_date + timedelta(days=nights),
+            status=booking_status
+        )
+
+    def test_calendar_matrix(self):
+        """Test that every room gets one flag per night, ignoring inactive bookings"""
+        self.book(self.rooms[0], -2, 3)
+        self.book(self.rooms[0], 3, 5)
+        self.book(self.rooms[1], 1, 2, 'cancelled')
+
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['nights']), 5)
+        calendar = {room['id']: room['available'] for room in response.data['rooms']}
+        self.assertEqual(calendar[self.rooms[0].id], [False, True, True, False, False])
+        self.assertEqual(calendar[self.rooms[1].id], [True] * 5)
+        self.assertEqual(calendar[self.rooms[2].id], [True] * 5)
+
+    def test_calendar_is_one_query(self):
+        """Test that the matrix costs one query regardless of rooms and bookings"""
+        for room in self.rooms:
+            self.book(room, 0, 2)
+            self.book(room, 3, 1)
+        # Hotel lookup plus the calendar query
+        with self.assertNumQueries(2):
+            self.client.get(self.url, self.params)
+
+    def test_etag_revalidation(self):
+        """Test that a matching If-None-Match gets a 304 until a booking changes the calendar"""
+        etag = self.client.get(self.url, self.params)['ETag']
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        self.book(self.rooms[2], 0, 1)
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_invalid_window(self):
+        """Test that missing, reversed and oversized windows are rejected"""
+        too_long = {
+            'from': self.params['from'],
+            'to': (self.start_date + timedelta(days=400)).isoformat(),
+        }
+        reversed_window = {'from': self.params['to'], 'to': self.params['from']}
+        for params in ({}, {'from': 'tomorrow', 'to': self.params['to']}, reversed_window, too_long):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class HotelBookingExportTests(APITestCase):
+    def setUp(self):
+        self.guest = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Test',
+            last_name='Guest',
+            password='testpass123'
+        )
+        self.owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        hotel = Hotel.objects.create(user=self.owner, name='Export Hotel', stars=3, address='1 Export St')
+        room = Room.objects.create(
+            hotel=hotel,
+            price=100,
+            bed_count=2,
+            max_adults=2,
+            room_type=RoomType.DOUBLE
+        )
+        self.start_date = date.today() + timedelta(days=10)
+        for index, booking_status in enumerate(['pending', 'confirmed', 'cancelled', 'completed', 'confirmed']):
+            start_date = self.start_date + timedelta(days=index * 3)
+            Booking.objects.create(
+                room=room,
+                user=self.guest,
+                start_date=start_date,
+                end_date=start_date + timedelta(days=2),
+                status=booking_status
+            )
+        self.client.force_authenticate(user=self.owner)
+
+    def test_bookings_are_paginated(self):
+        """Test that the owner's bookings come back a page at a time, newest first"""
+        url = reverse('my-hotel-bookings')
+        first = self.client.get(url, {'page_size': 3})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first.data['results']), 3)
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 2)
+        self.assertIsNone(second.data['next'])
+        start_dates = [booking['start_date'] for booking in first.data['results'] + second.data['results']]
+        self.assertEqual(start_dates, sorted(start_dates, reverse=True))
+
+    def test_bookings_filters(self):
+        """Test that bookings can be filtered by status and date range"""
+        url = reverse('my-hotel-bookings')
+        response = self.client.get(url, {'status': 'confirmed,pending'})
+        self.assertEqual(len(response.data['results']), 3)
+        response = self.client.get(url, {
+            'from': (self.start_date + timedelta(days=1)).isoformat(),
+            'to': (self.start_date + timedelta(days=4)).isoformat(),
+        })
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(self.client.get(url, {'status': 'lost'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'from': 'soon'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_csv_export(self):
+        """Test that the CSV export streams a header and one line per booking"""
+        url = reverse('my-hotel-export-bookings', args=['csv'])
+        response = self.client.get(url, {'status': 'confirmed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('id,room_id,room_type,guest_email'))
+        self.assertIn('guest@example.com', lines[1])
+        self.assertTrue(lines[1].endswith(',2,200.00'))
+
+    def test_csv_export_escapes_formulas(self):
+        """Test that guest names starting like a formula are exported as text"""
+        self.guest.first_name = '=HYPERLINK("http://example.com")'
+        self.guest.last_name = '@SUM(A1)'
+        self.guest.save()
+        url = reverse('my-hotel-export-bookings', args=['csv'])
+        response = self.client.get(url, {'status': 'pending'})
+        content = b''.join(response.streaming_content).decode()
+        row = next(csv.DictReader(StringIO(content)))
+        self.assertEqual(row['guest_first_name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row['guest_last_name'], "'@SUM(A1)")
+        self.assertEqual(row['guest_email'], 'guest@example.com')
+
+    def test_ndjson_export(self):
+        """Test that the NDJSON export writes one JSON object per booking"""
+        url = reverse('my-hotel-export-bookings', args=['ndjson'])
+        response = self.client.get(url)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['start_date'], (self.start_date + timedelta(days=12)).isoformat())
+        self.assertEqual(rows[0]['total_price'], '200.00')
+
+    def test_export_requires_hotel(self):
+        """Test that users without a hotel can't export bookings"""
+        self.client.force_authenticate(user=self.guest)
+        url = reverse('my-hotel-export-bookings', args=['csv'])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookingRepresentationTests(APITestCase):
+    def setUp(self):
+        self.guest = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Test',
+            last_name='Guest',
+            password='testpass123'
+        )
+        owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(user=owner, name='Booking Hotel', stars=3, address='1 Booking St')
+        self.start_date = date.today() + timedelta(days=10)
+        self.client.force_authenticate(user=self.guest)
+
+    def add_bookings(self, count):
+        for index in range(count):
+            room = Room.objects.create(
+                hotel=self.hotel,
+                price=80 + index,
+                bed_count=2,
+                max_adults=2,
+                room_type=RoomType.DOUBLE
+            )
+            RoomImage.objects.create(room=room, image=f'room_images/room{room.id}.jpg')
+            Booking.objects.create(
+                room=room,
+                user=self.guest,
+                start_date=self.start_date,
+                end_date=self.start_date + timedelta(days=3)
+            )
+
+    def count_list_queries(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('booking-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_list_queries_are_constant(self):
+        """Test that listing bookings doesn't load rooms, hotels or images per booking"""
+        self.add_bookings(2)
+        # The first request also looks up whether the guest owns a hotel
+        self.count_list_queries()
+        few = self.count_list_queries()
+        self.add_bookings(5)
+        self.assertEqual(self.count_list_queries(), few)
+
+    def test_total_price_computed_in_sql(self):
+        """Test that the annotated total price matches nights times the nightly price"""
+        self.add_bookings(1)
+        booking = Booking.objects.with_details().get()
+        self.assertEqual(booking.total_price, 240)
+        response = self.client.get(reverse('booking-list'))
+        self.assertEqual(response.data[0]['total_price'], 240)
+        self.assertEqual(response.data[0]['user']['email'], 'guest@example.com')
+
+    def test_compact_representation(self):
+        """Test that compact mode returns a room summary without images"""
+        self.add_bookings(1)
+        full = self.client.get(reverse('booking-list')).data[0]['room']
+        compact = self.client.get(reverse('booking-list'), {'compact': '1'}).data[0]['room']
+        self.assertIn('images', full)
+        self.assertEqual(
+            set(compact),
+            {'id', 'price', 'room_type', 'hotel_name', 'hotel_address', 'hotel_id'}
+        )
+        self.assertEqual(compact['hotel_name'], 'Booking Hotel')
+
+    def test_reschedule_updates_total_price(self):
+        """Test that a rescheduled booking reports the price of its new dates"""
+        self.add_bookings(1)
+        booking = Booking.objects.get()
+        response = self.client.post(reverse('booking-reschedule', args=[booking.id]), {
+            'start_date': self.start_date.isoformat(),
+            'end_date': (self.start_date + timedelta(days=5)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_price'], 400)
+
+
+class HotelPaginationTests(APITestCase):
+    def setUp(self):
+        for index in range(5):
+            owner = User.objects.create_user(
+                email=f'owner{index}@example.com',
+                first_name='Hotel',
+                last_name='Owner',
+                password='testpass123',
+                role='HOTEL'
+            )
+            Hotel.objects.create(
+                user=owner,
+                name=f'Hotel {index}',
+                stars=3,
+                address=f'{index} Page St',
+                is_approved=True
+            )
+        self.hotels_url = reverse('hotel-list')
+
+    def test_cursor_pagination(self):
+        """Test walking every page of results with the cursor"""
+        response = self.client.get(self.hotels_url, {'page_size': 2})
+        names = [hotel['name'] for hotel in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            names.extend(hotel['name'] for hotel in response.data['results'])
+        self.assertEqual(names, [f'Hotel {index}' for index in range(5)])
+
+    def test_list_uses_slim_representation(self):
+        """Test that listings omit the nested rooms returned on detail"""
+        response = self.client.get(self.hotels_url)
+        hotel = response.data['results'][0]
+        self.assertEqual(
+            set(hotel),
+            {'id', 'name', 'address', 'city', 'country', 'stars', 'price_per_night',
+             'guest_score', 'review_count', 'distance_to_center', 'photo_url', 'distance_km'}
+        )
+        detail = self.client.get(reverse('hotel-detail', args=[hotel['id']]))
+        self.assertIn('rooms', detail.data)
+
+
+class HotelPrefetchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123'
+        )
+        self.wifi = Feature.objects.create(name='Wifi', is_amenity=True)
+        self.view = Feature.objects.create(name='Sea view')
+        self.client.force_authenticate(user=self.user)
+        self.favorites_url = reverse('favoritehotel-list')
+
+    def create_hotel(self, index):
+        owner = User.objects.create_user(
+            email=f'owner{index}@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        hotel = Hotel.objects.create(
+            user=owner,
+            name=f'Hotel {index}',
+            address=f'{index} Prefetch St',
+            is_approved=True
+        )
+        hotel.features.set([self.wifi, self.view])
+        HotelImage.objects.bulk_create([
+            HotelImage(hotel=hotel, image=f'hotel_images/{index}-{n}.jpg') for n in range(2)
+        ])
+        for n in range(2):
+            room = Room.objects.create(hotel=hotel, price=100 + n, room_type=RoomType.DOUBLE)
+            RoomImage.objects.create(room=room, image=f'room_images/{index}-{n}.jpg')
+        FavoriteHotel.objects.create(user=self.user, hotel=hotel)
+        return hotel
+
+    def count_queries(self, url):
+        # Measure with the sidebar badge stats cold every time
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_favorites_query_count_is_constant(self):
+        """Test that listing favorites does not issue queries per hotel"""
+        self.create_hotel(0)
+        single = self.count_queries(self.favorites_url)
+        for index in range(1, 4):
+            self.create_hotel(index)
+        self.assertEqual(self.count_queries(self.favorites_url), single)
+
+    def test_detail_reads_from_prefetch(self):
+        """Test that features are split into amenities from the prefetch cache"""
+        hotel = self.create_hotel(0)
+        url = reverse('hotel-detail', args=[hotel.id])
+        response = self.client.get(url)
+        self.assertEqual(response.data['amenities'], ['Wifi'])
+        self.assertEqual(response.data['features'], ['Sea view'])
+        self.assertEqual(len(response.data['rooms']), 2)
+        self.assertLessEqual(self.count_queries(url), 6)
+
+
+
+class FavoriteBulkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123'
+        )
+        self.hotels = []
+        for index in range(3):
+            owner = User.objects.create_user(
+                email=f'owner{index}@example.com',
+                first_name='Hotel',
+                last_name='Owner',
+                password='testpass123',
+                role='HOTEL'
+            )
+            hotel = Hotel.objects.create(user=owner, name=f'Hotel {index}', address=f'{index} Favorite St')
+            Room.objects.create(hotel=hotel, price=100, room_type=RoomType.DOUBLE)
+            self.hotels.append(hotel)
+        FavoriteHotel.objects.create(user=self.user, hotel=self.hotels[0])
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_returns_hotel_cards(self):
+        """Test that favorites embed compact hotel cards instead of full hotels"""
+        response = self.client.get(reverse('favoritehotel-list'))
+        hotel = response.data[0]['hotel']
+        self.assertEqual(hotel['name'], 'Hotel 0')
+        self.assertIn('photo_url', hotel)
+        self.assertNotIn('rooms', hotel)
+
+    def test_bulk_add_and_remove(self):
+        """Test that favorites can be added and removed in one request"""
+        response = self.client.post(reverse('favoritehotel-bulk'), {
+            'add': [self.hotels[1].id, self.hotels[2].id, 99999],
+            'remove': [self.hotels[0].id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            str(self.hotels[0].id): False,
+            str(self.hotels[1].id): True,
+            str(self.hotels[2].id): True,
+            '99999': False,
+        })
+        favorites = set(FavoriteHotel.objects.filter(user=self.user).values_list('hotel_id', flat=True))
+        self.assertEqual(favorites, {self.hotels[1].id, self.hotels[2].id})
+
+        # Adding existing favorites again is a no-op
+        response = self.client.post(reverse('favoritehotel-bulk'), {'add': [self.hotels[1].id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(FavoriteHotel.objects.filter(user=self.user).count(), 2)
+
+    def test_bulk_rejects_conflicting_ids(self):
+        """Test that a hotel can't be added and removed in the same request"""
+        response = self.client.post(reverse('favoritehotel-bulk'), {
+            'add': [self.hotels[1].id],
+            'remove': [self.hotels[1].id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_status_map(self):
+        """Test that the status endpoint answers for the given ids in one query"""
+        ids = ','.join(str(hotel.id) for hotel in self.hotels)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('favoritehotel-status'), {'ids': ids})
+        self.assertEqual(response.data, {
+            str(self.hotels[0].id): True,
+            str(self.hotels[1].id): False,
+            str(self.hotels[2].id): False,
+        })
+        response = self.client.get(reverse('favoritehotel-status'), {'ids': '1,two'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class QueryBudgetTests(APITestCase):
+    def setUp(self):
+        self.data = seed_dataset(hotels=4, rooms_per_hotel=3, bookings_per_room=2, reviews_per_hotel=3)
+
+    def test_hotel_endpoints_within_query_budget(self):
+        """Test that every budgeted hotels endpoint stays within its query budget"""
+        for endpoint in ENDPOINTS:
+            if not endpoint['name'].startswith('hotels:') or endpoint['budget'] is None:
+                continue
+            with self.subTest(endpoint=endpoint['name']):
+                result = measure_endpoint(self.client, endpoint, self.data)
+                self.assertEqual(result['status'], status.HTTP_200_OK)
+                self.assertLessEqual(result['queries'], endpoint['budget'])
+
+
+class BookingConflictTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123'
+        )
+        self.hotel_user = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(
+            user=self.hotel_user,
+            name='Busy Hotel',
+            address='1 Busy St'
+        )
+        self.room = Room.objects.create(
+            hotel=self.hotel,
+            price=100,
+            room_type=RoomType.DOUBLE
+        )
+        self.client.force_authenticate(user=self.user)
+        self.bookings_url = reverse('booking-list')
+        self.booking_data = {
+            'room': self.room.id,
+            'start_date': date.today() + timedelta(days=1),
+            'end_date': date.today() + timedelta(days=3)
+        }
+
+    def test_double_booking_returns_conflict(self):
+        """Test that booking already booked dates fails with 409"""
+        first = self.client.post(self.bookings_url, self.booking_data, format='json')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        second = self.client.post(self.bookings_url, self.booking_data, format='json')
+        self.assertEqual(second.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_reschedule_into_booked_dates_returns_conflict(self):
+        """Test that rescheduling onto another booking fails with 409"""
+        self.client.post(self.bookings_url, self.booking_data, format='json')
+        later = Booking.objects.create(
+            room=self.room,
+            user=self.user,
+            start_date=date.today() + timedelta(days=5),
+            end_date=date.today() + timedelta(days=7)
+        )
+        response = self.client.post(
+            reverse('booking-reschedule', args=[later.id]),
+            {
+                'start_date': self.booking_data['start_date'].isoformat(),
+                'end_date': self.booking_data['end_date'].isoformat(),
+            },
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+
+class GuestScoreTests(TestCase):
+    def setUp(self):
+        self.hotel_user = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(
+            user=self.hotel_user,
+            name='Rated Hotel',
+            address='1 Rated St'
+        )
+        self.guests = [
+            User.objects.create_user(
+                email=f'guest{index}@example.com',
+                first_name='Guest',
+                last_name=f'{index}',
+                password='testpass123'
+            )
+            for index in range(3)
+        ]
+
+    def review(self, guest, rating):
+        return Review.objects.create(hotel=self.hotel, user=guest, rating=rating, comment='Nice')
+
+    def test_running_totals_follow_review_writes(self):
+        """Test that creating, editing and deleting reviews updates the score"""
+        first = self.review(self.guests[0], 5)
+        self.review(self.guests[1], 3)
+        self.hotel.refresh_from_db()
+        self.assertEqual((self.hotel.review_count, self.hotel.review_rating_sum), (2, 8))
+        self.assertEqual(self.hotel.guest_score, 4.0)
+
+        first = Review.objects.get(pk=first.pk)
+        first.rating = 2
+        first.save()
+        self.hotel.refresh_from_db()
+        self.assertEqual(self.hotel.guest_score, 2.5)
+
+        first.delete()
+        self.hotel.refresh_from_db()
+        self.assertEqual((self.hotel.review_count, self.hotel.guest_score), (1, 3.0))
+
+    def test_full_save_keeps_concurrent_review_totals(self):
+        """Test that saving a hotel loaded before a review doesn't erase it"""
+        stale = Hotel.objects.get(pk=self.hotel.pk)
+        self.review(self.guests[0], 5)
+        stale.name = 'Renamed Hotel'
+        stale.save()
+        self.hotel.refresh_from_db()
+        self.assertEqual(self.hotel.name, 'Renamed Hotel')
+        self.assertEqual((self.hotel.review_count, self.hotel.review_rating_sum), (1, 5))
+        self.assertEqual(self.hotel.guest_score, 5.0)
+
+    def test_last_review_deleted_clears_score(self):
+        """Test that a hotel without reviews has no guest score"""
+        self.review(self.guests[0], 4).delete()
+        self.hotel.refresh_from_db()
+        self.assertEqual(self.hotel.review_count, 0)
+        self.assertIsNone(self.hotel.guest_score)
+
+    def test_reconcile_command_fixes_drift(self):
+        """Test that the reconciliation command recomputes drifted totals"""
+        self.review(self.guests[0], 4)
+        self.review(self.guests[1], 2)
+        Hotel.objects.filter(pk=self.hotel.pk).update(review_count=7, review_rating_sum=1, guest_score=0)
+        call_command('reconcile_guest_scores', stdout=StringIO())
+        self.hotel.refresh_from_db()
+        self.assertEqual((self.hotel.review_count, self.hotel.review_rating_sum), (2, 6))
+        self.assertEqual(self.hotel.guest_score, 3.0)
+        self.assertFalse(Hotel.objects.drifted().exists())
+
+    def test_guest_score_drift_is_detected(self):
+        """Test that a guest score not matching the totals counts as drift"""
+        for guest, rating in zip(self.guests, (1, 1, 2)):
+            self.review(guest, rating)
+        self.assertFalse(Hotel.objects.drifted().exists())
+        Hotel.objects.filter(pk=self.hotel.pk).update(guest_score=0)
+        self.assertTrue(Hotel.objects.drifted().exists())
+        call_command('reconcile_guest_scores', stdout=StringIO())
+        self.hotel.refresh_from_db()
+        self.assertAlmostEqual(self.hotel.guest_score, 4 / 3)
+        self.assertFalse(Hotel.objects.drifted().exists())
+
+
+class AveragePriceTests(TestCase):
+    def setUp(self):
+        self.hotels = []
+        for index in range(2):
+            owner = User.objects.create_user(
+                email=f'owner{index}@example.com',
+                first_name='Hotel',
+                last_name='Owner',
+                password='testpass123',
+                role='HOTEL'
+            )
+            self.hotels.append(Hotel.objects.create(user=owner, name=f'Hotel {index}', address='1 Price St'))
+        Room.objects.create(hotel=self.hotels[0], price=100, room_type=RoomType.SINGLE)
+        Room.objects.create(hotel=self.hotels[0], price=250, room_type=RoomType.DOUBLE)
+
+    def test_room_writes_update_average(self):
+        """Test that saving and deleting rooms keeps the average price current"""
+        self.hotels[0].refresh_from_db()
+        self.assertEqual(self.hotels[0].price_per_night, 175)
+        self.hotels[0].rooms.get(price=250).delete()
+        self.hotels[0].refresh_from_db()
+        self.assertEqual(self.hotels[0].price_per_night, 100)
+
+    def test_bulk_recompute_command(self):
+        """Test that the bulk mode recomputes every hotel in one statement"""
+        Hotel.objects.update(price_per_night=1)
+        with self.assertNumQueries(1):
+            call_command('update_hotel_prices', '--bulk', stdout=StringIO())
+        first, second = (Hotel.objects.get(pk=hotel.pk) for hotel in self.hotels)
+        self.assertEqual(first.price_per_night, 175)
+        self.assertIsNone(second.price_per_night)
+
+
+@override_settings(HOTEL_SEARCH_CACHE_ENABLED=True)
+class SearchCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.hotel_user = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(
+            user=self.hotel_user,
+            name='Cached Hotel',
+            address='1 Cache St, Sofia',
+            is_approved=True
+        )
+        self.hotels_url = reverse('hotel-list')
+
+    def test_equivalent_searches_share_an_entry(self):
+        """Test that normalized query params hit the same cache entry"""
+        first = self.client.get(self.hotels_url, {'city': 'Sofia', 'beds': ''})
+        second = self.client.get(self.hotels_url, {'city': '  sofia '})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_writes_invalidate_cached_responses(self):
+        """Test that changing a hotel drops its cached search results"""
+        detail_url = reverse('hotel-detail', args=[self.hotel.id])
+        self.client.get(detail_url)
+        self.hotel.name = 'Renamed Hotel'
+        self.hotel.save()
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['name'], 'Renamed Hotel')
+
+    @override_settings(HOTEL_SEARCH_CACHE_ENABLED=False)
+    def test_responses_are_not_cached_when_disabled(self):
+        """Test that search responses bypass the cache without a shared backend"""
+        self.client.get(self.hotels_url)
+        response = self.client.get(self.hotels_url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_cache_is_invalidated_again_on_commit(self):
+        """Test that responses cached while a write is uncommitted are dropped at commit"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.name = 'Renamed Hotel'
+            self.hotel.save()
+            uncommitted_generation = search_cache.current_generation()
+        self.assertNotEqual(search_cache.current_generation(), uncommitted_generation)
+
+    def test_cache_stats_for_admins(self):
+        """Test that hit and miss counters are exposed to staff only"""
+        self.client.get(self.hotels_url)
+        self.client.get(self.hotels_url)
+        stats_url = reverse('hotel-cache-stats')
+        self.assertEqual(self.client.get(stats_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = User.objects.create_superuser(
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(stats_url)
+        self.assertEqual((response.data['hits'], response.data['misses']), (1, 1))
+
+
+class AdminDashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.guest = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123'
+        )
+        hotel = Hotel.objects.create(user=self.owner, name='Dashboard Hotel', address='1 Main St, Sofia')
+        room = Room.objects.create(hotel=hotel, price=100, bed_count=1, max_adults=2, room_type=RoomType.SINGLE)
+        today = date.today()
+        Booking.objects.create(room=room, user=self.guest, start_date=today, end_date=today + timedelta(days=2))
+        Booking.objects.create(room=room, user=self.guest, start_date=today + timedelta(days=5),
+                               end_date=today + timedelta(days=6), status='completed')
+        Review.objects.create(hotel=hotel, user=self.guest, rating=4, comment='Nice')
+
+    def test_dashboard_stats_use_few_queries(self):
+        """Test that the dashboard counters come from one query per table and are cached"""
+        from backend.admin import dashboard_callback, pending_bookings_count
+
+        with CaptureQueriesContext(connection) as context:
+            stats = dashboard_callback(None, {})['dashboard_stats']
+        # users, hotels, bookings, reviews and the monthly bookings chart
+        self.assertEqual(len(context.captured_queries), 5)
+        self.assertEqual(stats['users']['total'], 2)
+        self.assertEqual(stats['users']['hotel_owners'], 1)
+        self.assertEqual(stats['bookings']['pending'], 1)
+        self.assertEqual(stats['hotels']['active'], 1)
+        self.assertEqual(stats['reviews']['avg_rating'], 4)
+
+        with CaptureQueriesContext(connection) as context:
+            dashboard_callback(None, {})
+            self.assertEqual(pending_bookings_count(None), 1)
+        self.assertEqual(len(context.captured_queries), 0)
+
+
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+        self.feature = Feature.objects.create(name='Pool', is_amenity=True)
+        self.guest = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123'
+        )
+
+    def add_hotels(self, count):
+        today = date.today()
+        for index in range(count):
+            owner = User.objects.create_user(
+                email=f'owner{Hotel.objects.count()}@example.com',
+                first_name='Hotel',
+                last_name='Owner',
+                password='testpass123',
+                role='HOTEL'
+            )
+            hotel = Hotel.objects.create(user=owner, name=f'Hotel {index}', address='1 Main St, Sofia')
+            hotel.features.add(self.feature)
+            for offset in range(2):
+                room = Room.objects.create(hotel=hotel, price=100, bed_count=1, max_adults=2, room_type=RoomType.SINGLE)
+                Booking.objects.create(room=room, user=self.guest, start_date=today + timedelta(days=offset),
+                                       end_date=today + timedelta(days=offset + 1))
+            Review.objects.create(hotel=hotel, user=self.guest, rating=4, comment='Nice')
+            FavoriteHotel.objects.create(user=self.guest, hotel=hotel)
+
+    def count_queries(self, url):
+        # Measure with the sidebar badge stats cold every time
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_changelists_do_not_scale_with_rows(self):
+        """Test that changelist query counts are independent of the number of rows"""
+        models = ['hotel', 'room', 'booking', 'review', 'feature', 'favoritehotel']
+        urls = [reverse(f'admin:hotels_{model}_changelist') for model in models]
+        self.add_hotels(2)
+        small = [self.count_queries(url) for url in urls]
+        self.add_hotels(5)
+        large = [self.count_queries(url) for url in urls]
+        for model, before, after in zip(models, small, large):
+            with self.subTest(model=model):
+                self.assertEqual(before, after)
+
+    def test_booking_actions_with_status_filter(self):
+        """Test that admin actions update the availability index even when the status filter stops matching"""
+        self.add_hotels(1)
+        pending = list(Booking.objects.values_list('id', flat=True))
+        url = reverse('admin:hotels_booking_changelist')
+
+        self.client.post(url + '?status__exact=pending', {'action': 'cancel_bookings', '_selected_action': pending})
+        self.assertFalse(RoomNight.objects.filter(booking__in=pending).exists())
+
+        self.client.post(url + '?status__exact=cancelled', {'action': 'confirm_bookings', '_selected_action': pending})
+        self.assertEqual(RoomNight.objects.filter(booking__in=pending).count(), 2)
+        self.assertEqual(set(Booking.objects.values_list('status', flat=True)), {'confirmed'})
+
+    def test_hotel_changelist_annotations(self):
+        """Test that annotated counts match the related rows"""
+        self.add_hotels(1)
+        response = self.client.get(reverse('admin:hotels_hotel_changelist'))
+        self.assertContains(response, '2 rooms')
+        self.assertContains(response, '2 bookings')
+        self.assertContains(response, '4.0/5.0')
+
+
+def make_upload(name='photo.jpg', size=(2400, 1600)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'blue').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class TemporaryMediaMixin:
+    """
+    Stores uploads in a throwaway local MEDIA_ROOT.
+    """
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, STORAGES={
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        })
+        self.settings_override.enable()
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+
+class ImageRenditionTests(TemporaryMediaMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(user=self.owner, name='Photo Hotel', address='1 Main St, Sofia', is_approved=True)
+
+    def test_upload_enqueues_renditions_after_commit(self):
+        """Test that saving an image schedules rendition generation on commit"""
+        with mock.patch.object(generate_renditions, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                image = HotelImage.objects.create(hotel=self.hotel, image=make_upload())
+        delay.assert_called_once_with('hotels.hotelimage', image.pk)
+
+    def test_renditions_are_generated_and_served(self):
+        """Test that the task writes resized renditions and serializers prefer them"""
+        with mock.patch.object(generate_renditions, 'delay'):
+            image = HotelImage.objects.create(hotel=self.hotel, image=make_upload())
+        response = self.client.get(reverse('hotel-list'))
+        self.assertTrue(response.data['results'][0]['photo_url'].endswith(image.image.name))
+
+        self.assertTrue(generate_renditions.apply(args=['hotels.hotelimage', image.pk]).get())
+        image.refresh_from_db()
+        self.assertEqual(image.renditions['source'], image.image.name)
+        with image.image.storage.open(image.renditions['thumbnail']) as thumbnail:
+            self.assertLessEqual(Image.open(thumbnail).size, (320, 240))
+
+        response = self.client.get(reverse('hotel-detail', args=[self.hotel.id]))
+        renditions = response.data['images'][0]['renditions']
+        self.assertTrue(renditions['card'].endswith(image.renditions['card']))
+        self.assertTrue(response.data['photo_url'].endswith(image.renditions['full']))
+
+    def test_replaced_image_discards_stale_renditions(self):
+        """Test that renditions built for a replaced file are not recorded"""
+        with mock.patch.object(generate_renditions, 'delay'):
+            image = HotelImage.objects.create(hotel=self.hotel, image=make_upload())
+
+        def replace_while_building(field_file):
+            HotelImage.objects.filter(pk=image.pk).update(image='hotel_images/other.jpg')
+            return {'source': field_file.name}
+
+        with mock.patch('hotels.tasks.build_renditions', side_effect=replace_while_building):
+            self.assertFalse(generate_renditions.apply(args=['hotels.hotelimage', image.pk]).get())
+        image.refresh_from_db()
+        self.assertEqual(image.renditions, {})
+
+
+class BatchImageUploadTests(TemporaryMediaMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(user=self.owner, name='Upload Hotel', address='1 Main St, Sofia')
+        self.client.force_authenticate(user=self.owner)
+
+    def test_update_hotel_inserts_images_in_one_query(self):
+        """Test that several uploaded photos are stored and inserted with one INSERT"""
+        uploads = [make_upload(f'Lobby Photo {index}.JPG', size=(40, 30)) for index in range(4)]
+        with mock.patch.object(generate_renditions, 'delay') as delay:
+            with CaptureQueriesContext(connection) as context:
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.put(reverse('my-hotel-update-hotel'), {'images': uploads}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        inserts = [q for q in context.captured_queries if q['sql'].startswith('INSERT INTO "hotels_hotelimage"')]
+        self.assertEqual(len(inserts), 1)
+        names = sorted(self.hotel.images.values_list('image', flat=True))
+        for index, name in enumerate(names):
+            self.assertRegex(name, rf'^hotel_images/lobby-photo-{index}-[0-9a-f]{{12}}\.jpg$')
+        self.assertEqual(delay.call_count, 4)
+
+    def test_room_images_use_batch_path(self):
+        """Test that room images are uploaded through the same batch path"""
+        room = Room.objects.create(hotel=self.hotel, price=100, bed_count=1, max_adults=2, room_type=RoomType.SINGLE)
+        with mock.patch.object(generate_renditions, 'delay'):
+            response = self.client.patch(
+                reverse('room-detail', args=[room.id]),
+                {'images': [make_upload('a.jpg', size=(40, 30)), make_upload('b.jpg', size=(40, 30))]},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(room.images.count(), 2)
+
+    def test_failed_upload_removes_stored_files(self):
+        """Test that a failed upload leaves neither rows nor orphaned files behind"""
+        storage = HotelImage._meta.get_field('image').storage
+        real_save = storage.save
+
+        def flaky_save(name, content, *args, **kwargs):
+            if 'broken' in name:
+                raise OSError('connection reset')
+            return real_save(name, content, *args, **kwargs)
+
+        with mock.patch.object(storage, 'save', side_effect=flaky_save):
+            with self.assertRaises(OSError):
+                bulk_create_images(HotelImage, [make_upload('ok.jpg'), make_upload('broken.jpg')], hotel=self.hotel)
+        self.assertFalse(self.hotel.images.exists())
+        self.assertFalse(storage.exists('hotel_images') and storage.listdir('hotel_images')[1])
+
+
+class FeatureUpsertTests(APITestCase):
+    def setUp(self):
+        clear_feature_cache()
+        self.owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(user=self.owner, name='Feature Hotel', address='1 Main St, Sofia')
+        self.pool = Feature.objects.create(name='Pool', is_amenity=True)
+        self.garden = Feature.objects.create(name='Garden')
+        self.hotel.features.set([self.pool, self.garden])
+        self.client.force_authenticate(user=self.owner)
+
+    def test_update_hotel_upserts_features(self):
+        """Test that features are replaced while amenities are kept"""
+        response = self.client.put(
+            reverse('my-hotel-update-hotel'),
+            {'features': ['Sea view', 'Rooftop bar', 'Sea view', ' ']},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.data['features']), ['Rooftop bar', 'Sea view'])
+        self.assertEqual(
+            set(self.hotel.features.values_list('name', flat=True)),
+            {'Pool', 'Sea view', 'Rooftop bar'}
+        )
+        self.assertFalse(Feature.objects.get(name='Sea view').is_amenity)
+
+    def test_many_features_cost_constant_queries(self):
+        """Test that resolving features doesn't issue queries per name"""
+        names = [f'Feature {index}' for index in range(60)]
+        with CaptureQueriesContext(connection) as context:
+            set_hotel_features(self.hotel, names)
+        feature_queries = [q for q in context.captured_queries if '"hotels_feature"' in q['sql']]
+        # The current links, one lookup, one insert and one read back of the new ids
+        self.assertEqual(len(feature_queries), 4)
+        self.assertEqual(self.hotel.features.count(), 61)
+
+        # Known names are served from the process cache
+        with CaptureQueriesContext(connection) as context:
+            set_hotel_features(self.hotel, names[:30])
+        feature_queries = [q for q in context.captured_queries if '"hotels_feature"' in q['sql']]
+        self.assertEqual(len(feature_queries), 1)
+        self.assertEqual(self.hotel.features.count(), 31)
+
+    def test_unchanged_features_are_not_rewritten(self):
+        """Test that resubmitting the same features writes nothing"""
+        set_hotel_features(self.hotel, ['Garden'])
+        with CaptureQueriesContext(connection) as context:
+            set_hotel_features(self.hotel, ['Garden'])
+        writes = [q for q in context.captured_queries if q['sql'].startswith(('INSERT', 'DELETE'))]
+        self.assertEqual(writes, [])
+
+    def test_deleted_feature_is_forgotten(self):
+        """Test that deleting a feature drops its cached id"""
+        resolve_feature_ids(['Garden'])
+        self.garden.delete()
+        set_hotel_features(self.hotel, ['Garden'])
+        self.assertNotEqual(Feature.objects.get(name='Garden').pk, self.garden.pk)
+        self.assertIn('Garden', self.hotel.features.values_list('name', flat=True))
+
+
+class FeatureCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.wifi = Feature.objects.create(name='Wifi', is_amenity=True)
+        self.garden = Feature.objects.create(name='Garden')
+
+    def test_catalog_is_read_from_cache(self):
+        """Test that an unchanged catalog costs no queries"""
+        feature_catalog()
+        with CaptureQueriesContext(connection) as context:
+            features, amenities = split_features([self.wifi.id, self.garden.id])
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(features, ['Garden'])
+        self.assertEqual(amenities, ['Wifi'])
+
+    def test_feature_writes_invalidate_catalog(self):
+        """Test that renaming and flagging a feature is picked up"""
+        feature_catalog()
+        self.garden.name = 'Rose garden'
+        self.garden.is_amenity = True
+        self.garden.save()
+        self.assertEqual(split_features([self.garden.id]), ([], ['Rose garden']))
+
+    def test_catalog_expires_without_shared_version(self):
+        """Test that a catalog is reloaded after CATALOG_TTL even if no version bump is seen"""
+        feature_catalog()
+        # A rename made by another worker whose version bump this process can't see
+        Feature.objects.filter(pk=self.garden.pk).update(name='Rose garden')
+        self.assertEqual(split_features([self.garden.id]), (['Garden'], []))
+        # The cached copy expires along with the process copy
+        cache.delete(f'hotels:features:catalog:{catalog_version()}')
+        later = time.monotonic() + CATALOG_TTL + 1
+        with mock.patch('hotels.features.time.monotonic', return_value=later):
+            self.assertEqual(split_features([self.garden.id]), (['Rose garden'], []))
+
+    def test_features_created_without_signals_are_loaded(self):
+        """Test that ids missing from the catalog trigger a reload"""
+        feature_catalog()
+        Feature.objects.bulk_create([Feature(name='Sauna')])
+        sauna = Feature.objects.get(name='Sauna')
+        self.assertEqual(split_features([sauna.id]), (['Sauna'], []))
+
+
+@mock_aws
+@override_settings(
+    AWS_STORAGE_BUCKET_NAME='tripffer-test',
+    AWS_S3_REGION_NAME='us-east-1',
+    AWS_ACCESS_KEY_ID='testing',
+    AWS_SECRET_ACCESS_KEY='testing',
+    STORAGES={
+        'default': {'BACKEND': 'backend.storage.MediaStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+)
+class DirectUploadTests(APITestCase):
+    def setUp(self):
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket='tripffer-test')
+        self.owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.hotel = Hotel.objects.create(user=self.owner, name='S3 Hotel', address='1 Main St, Sofia')
+        self.room = Room.objects.create(hotel=self.hotel, price=100, bed_count=1, max_adults=2, room_type=RoomType.SINGLE)
+        self.client.force_authenticate(user=self.owner)
+
+    def upload(self, presigned):
+        """Stand in for the browser POSTing the file to the presigned URL"""
+        self.s3.put_object(Bucket='tripffer-test', Key=presigned['fields']['key'], Body=make_upload().read())
+
+    def test_same_named_files_are_all_kept(self):
+        """Test that batch-uploaded photos sharing a file name don't overwrite each other on S3"""
+        storage = HotelImage._meta.get_field('image').storage
+        uploads = [make_upload('image.jpg', size=(40 + index, 30)) for index in range(8)]
+        with mock.patch.object(generate_renditions, 'delay'):
+            images = bulk_create_images(HotelImage, uploads, hotel=self.hotel)
+        names = [image.image.name for image in images]
+        self.assertEqual(len(set(names)), 8)
+        sizes = set()
+        for name in names:
+            with storage.open(name) as stored:
+                sizes.add(Image.open(stored).size)
+        self.assertEqual(sizes, {(40 + index, 30) for index in range(8)})
+
+    def test_hotel_image_presign_and_confirm(self):
+        """Test that a presigned hotel upload is registered as a HotelImage"""
+        response = self.client.post(reverse('my-hotel-presign-upload'), {'content_type': 'image/jpeg'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        key = response.data['key']
+        self.assertTrue(key.startswith(f'hotel_images/{self.hotel.id}/'))
+        self.assertEqual(response.data['fields']['key'], f'media/{key}')
+        self.assertEqual(response.data['fields']['Content-Type'], 'image/jpeg')
+
+        self.upload(response.data)
+        with mock.patch.object(generate_renditions, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('my-hotel-confirm-upload'), {'key': key}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image = self.hotel.images.get()
+        self.assertEqual(image.image.name, key)
+        delay.assert_called_once_with('hotels.hotelimage', image.pk)
+
+    def test_room_image_presign_and_confirm(self):
+        """Test that a presigned room upload is registered as a RoomImage"""
+        response = self.client.post(reverse('room-presign-upload', args=[self.room.id]), {'content_type': 'image/png'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['key'].startswith(f'room_images/{self.room.id}/'))
+        self.upload(response.data)
+        with mock.patch.object(generate_renditions, 'delay'):
+            response = self.client.post(reverse('room-confirm-upload', args=[self.room.id]), {'key': response.data['key']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.room.images.count(), 1)
+
+    def test_confirm_rejects_foreign_missing_and_duplicate_keys(self):
+        """Test that only existing, unregistered keys in the owner's folder are accepted"""
+        confirm_url = reverse('my-hotel-confirm-upload')
+        response = self.client.post(confirm_url, {'key': f'hotel_images/{self.hotel.id + 1}/other.jpg'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(confirm_url, {'key': f'hotel_images/{self.hotel.id}/missing.jpg'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        presigned = self.client.post(reverse('my-hotel-presign-upload'), {'content_type': 'image/jpeg'}, format='json').data
+        self.upload(presigned)
+        with mock.patch.object(generate_renditions, 'delay'):
+            self.assertEqual(self.client.post(confirm_url, {'key': presigned['key']}, format='json').status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.client.post(confirm_url, {'key': presigned['key']}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_presign_rejects_unsupported_content_type(self):
+        """Test that only image content types can be presigned"""
+        response = self.client.post(reverse('my-hotel-presign-upload'), {'content_type': 'text/html'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_presign_requires_s3_storage(self):
+        """Test that presigning is refused when media is stored locally"""
+        response = self.client.post(reverse('my-hotel-presign-upload'), {'content_type': 'image/jpeg'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+
+class HotelSearchTests(APITestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        spa = Feature.objects.create(name='Thermal Spa', is_amenity=True)
+        self.seaside = Hotel.objects.create(
+            user=owner, name='Seaside Resort', address='1 Beach Blvd, Varna, Bulgaria',
+            description='Rooms facing the Black Sea', is_approved=True
+        )
+        other_owner = User.objects.create_user(
+            email='other@example.com',
+            first_name='Other',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        self.mountain = Hotel.objects.create(
+            user=other_owner, name='Pirin Lodge', address='5 Ski Rd, Bansko, Bulgaria',
+            description='Chalet next to the lifts', is_approved=True
+        )
+        self.mountain.features.add(spa)
+        self.hotels_url = reverse('hotel-list')
+
+    def search(self, **params):
+        response = self.client.get(self.hotels_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [hotel['id'] for hotel in response.data['results']]
+
+    def test_q_matches_name_description_and_features(self):
+        """Test that q searches hotel names, descriptions and feature names"""
+        self.assertEqual(self.search(q='seaside'), [self.seaside.id])
+        self.assertEqual(self.search(q='black sea'), [self.seaside.id])
+        self.assertEqual(self.search(q='thermal'), [self.mountain.id])
+        self.assertEqual(self.search(q='bulgaria'), [self.seaside.id, self.mountain.id])
+
+    def test_every_term_must_match(self):
+        """Test that multi-word queries only return hotels matching all terms"""
+        self.assertEqual(self.search(q='lodge varna'), [])
+
+    def test_q_combines_with_city(self):
+        """Test that q narrows a city search"""
+        self.assertEqual(self.search(city='bansko', q='chalet'), [self.mountain.id])
+        self.assertEqual(self.search(city='varna', q='chalet'), [])
+
+    def test_pagination_keeps_view_ordering(self):
+        """Test that cursor pagination keeps an ordering applied by the view, e.g. search rank"""
+        paginator = HotelCursorPagination()
+        self.assertEqual(paginator.get_ordering(None, Hotel.objects.order_by('-stars'), None), ('-stars', 'id'))
+        self.assertEqual(paginator.get_ordering(None, Hotel.objects.all(), None), ('id',))
+
+
+class HotelRankingTests(APITestCase):
+    def setUp(self):
+        self.pool = Feature.objects.create(name='Pool', is_amenity=True)
+        self.spa = Feature.objects.create(name='Spa', is_amenity=True)
+        self.budget = self.create_hotel(0, stars=2, price_per_night=60, guest_score=3.5, distance_to_center=4.0)
+        self.midrange = self.create_hotel(1, stars=3, price_per_night=120, guest_score=4.6, distance_to_center=1.2)
+        self.luxury = self.create_hotel(2, stars=5, price_per_night=340, guest_score=4.9, distance_to_center=0.3)
+        self.unrated = self.create_hotel(3, stars=4, price_per_night=150)
+        self.midrange.features.add(self.pool)
+        self.luxury.features.add(self.pool, self.spa)
+        self.hotels_url = reverse('hotel-list')
+
+    def create_hotel(self, index, **fields):
+        owner = User.objects.create_user(
+            email=f'owner{index}@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        return Hotel.objects.create(
+            user=owner, name=f'Hotel {index}', address=f'{index} Main St, Sofia, Bulgaria',
+            is_approved=True, **fields
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.hotels_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [hotel['id'] for hotel in response.data['results']]
+
+    def test_ordering(self):
+        """Test that hotels are sorted by price, stars, score and distance"""
+        self.assertEqual(
+            self.search(ordering='price'),
+            [self.budget.id, self.midrange.id, self.unrated.id, self.luxury.id]
+        )
+        self.assertEqual(
+            self.search(ordering='-stars'),
+            [self.luxury.id, self.unrated.id, self.midrange.id, self.budget.id]
+        )
+        # Hotels without a value are listed last in either direction
+        self.assertEqual(
+            self.search(ordering='-score'),
+            [self.luxury.id, self.midrange.id, self.budget.id, self.unrated.id]
+        )
+        self.assertEqual(
+            self.search(ordering='score'),
+            [self.budget.id, self.midrange.id, self.luxury.id, self.unrated.id]
+        )
+        self.assertEqual(
+            self.search(ordering='distance'),
+            [self.luxury.id, self.midrange.id, self.budget.id, self.unrated.id]
+        )
+
+    def test_ordering_keeps_every_hotel(self):
+        """Test that sorting returns the same hotels as the unsorted listing"""
+        self.unpriced = self.create_hotel(4, stars=1)
+        unsorted = set(self.search())
+        self.assertEqual(len(unsorted), 5)
+        for ordering in ('price', '-price', 'stars', '-stars', 'score', '-score', 'distance', '-distance', 'name'):
+            self.assertEqual(set(self.search(ordering=ordering)), unsorted, ordering)
+            # Also when page boundaries fall among hotels without a value
+            response = self.client.get(self.hotels_url, {'ordering': ordering, 'page_size': 2})
+            paged = [hotel['id'] for hotel in response.data['results']]
+            while response.data['next']:
+                response = self.client.get(response.data['next'])
+                paged.extend(hotel['id'] for hotel in response.data['results'])
+            self.assertEqual(sorted(paged), sorted(unsorted), ordering)
+
+    def test_ordered_pages_follow_on(self):
+        """Test that the cursor continues a sorted listing from the last hotel"""
+        unscored = self.create_hotel(4, stars=1)
+        response = self.client.get(self.hotels_url, {'ordering': '-score', 'page_size': 2})
+        pages = [[hotel['id'] for hotel in response.data['results']]]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            pages.append([hotel['id'] for hotel in response.data['results']])
+        self.assertEqual(pages, [
+            [self.luxury.id, self.midrange.id],
+            [self.budget.id, unscored.id],
+            [self.unrated.id],
+        ])
+
+    def test_range_filters(self):
+        """Test that price, stars, score and distance ranges narrow the results"""
+        self.assertEqual(
+            self.search(price_min=100, price_max=200, ordering='price'),
+            [self.midrange.id, self.unrated.id]
+        )
+        self.assertEqual(self.search(stars_min=4, stars_max=4), [self.unrated.id])
+        self.assertEqual(self.search(score_min=4.5, ordering='-score'), [self.luxury.id, self.midrange.id])
+        self.assertEqual(self.search(distance_max=1.5, ordering='distance'), [self.luxury.id, self.midrange.id])
+        self.assertEqual(len(self.search(price_min='cheap', score_min='nan')), 4)
+
+    def test_amenities_must_all_match(self):
+        """Test that the amenity filter only returns hotels having every amenity"""
+        self.assertEqual(self.search(amenities='Pool', ordering='price'), [self.midrange.id, self.luxury.id])
+        self.assertEqual(self.search(amenities='Pool,Spa'), [self.luxury.id])
+        self.assertEqual(self.search(amenities='Pool,Sauna'), [])
+
+
+class HotelLocationTests(APITestCase):
+    def setUp(self):
+        self.hotels_url = reverse('hotel-list')
+
+    def create_hotel(self, name, address, **fields):
+        owner = User.objects.create_user(
+            email=f'{name.lower().replace(" ", "-")}@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        return Hotel.objects.create(user=owner, name=name, address=address, is_approved=True, **fields)
+
+    def search(self, **params):
+        response = self.client.get(self.hotels_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+
+    def test_parse_address(self):
+        """Test splitting free-text addresses into city and country"""
+        self.assertEqual(parse_address('12 Vitosha Blvd, 1000 Sofia, Bulgaria'), ('Sofia', 'Bulgaria'))
+        self.assertEqual(parse_address('Main St 5, Varna 9000 , Bulgaria'), ('Varna', 'Bulgaria'))
+        self.assertEqual(parse_address('Somewhere'), ('', ''))
+
+    def test_location_follows_address_changes(self):
+        """Test that city and country are derived on save and refreshed when the address changes"""
+        hotel = self.create_hotel('Central', '1 Main St, Sofia, Bulgaria', latitude=42.69, longitude=23.32)
+        self.assertEqual((hotel.city, hotel.country), ('Sofia', 'Bulgaria'))
+
+        hotel = Hotel.objects.get(pk=hotel.pk)
+        hotel.address = '3 Sea Rd, Varna, Bulgaria'
+        hotel.save()
+        hotel.refresh_from_db()
+        self.assertEqual(hotel.city, 'Varna')
+        self.assertIsNone(hotel.latitude)
+
+        hotel = Hotel.objects.get(pk=hotel.pk)
+        hotel.address = '4 Sea Rd, Golden Sands Resort, Bulgaria'
+        hotel.city = 'Golden Sands'
+        hotel.save()
+        hotel.refresh_from_db()
+        self.assertEqual(hotel.city, 'Golden Sands')
+
+    def test_exact_city_and_country_filters(self):
+        """Test filtering on the parsed city and country"""
+        sofia = self.create_hotel('Central', '1 Main St, Sofia, Bulgaria')
+        self.create_hotel('Suburb', '2 Ring Rd, Sofia Province, Bulgaria')
+        self.create_hotel('Abroad', '3 High St, London, United Kingdom')
+        self.assertEqual([hotel['id'] for hotel in self.search(city_exact='sofia')], [sofia.id])
+        self.assertEqual(len(self.search(country='BULGARIA')), 2)
+
+    def test_radius_search(self):
+        """Test that radius searches return nearby hotels, nearest first, with their distance"""
+        sofia = self.create_hotel('Central', '1 Main St, Sofia, Bulgaria', latitude=42.6977, longitude=23.3219)
+        plovdiv = self.create_hotel('Old Town', '1 Main St, Plovdiv, Bulgaria', latitude=42.1354, longitude=24.7453)
+        self.create_hotel('Unlocated', '1 Main St, Ruse, Bulgaria')
+
+        results = self.search(lat=42.70, lon=23.33, radius_km=20)
+        self.assertEqual([hotel['id'] for hotel in results], [sofia.id])
+        self.assertLess(results[0]['distance_km'], 1)
+
+        results = self.search(lat=42.70, lon=23.33, radius_km=200)
+        self.assertEqual([hotel['id'] for hotel in results], [sofia.id, plovdiv.id])
+        self.assertAlmostEqual(results[1]['distance_km'], 132, delta=3)
+
+    def test_backfill_command(self):
+        """Test that the backfill command parses cities and geocodes missing coordinates"""
+        hotel = self.create_hotel('Central', '1 Main St, Sofia, Bulgaria')
+        Hotel.objects.filter(pk=hotel.pk).update(city='', country='')
+        with mock.patch('hotels.management.commands.backfill_hotel_locations.geocode', return_value=(42.7, 23.3)):
+            call_command('backfill_hotel_locations', '--geocode', '--delay', '0', stdout=StringIO())
+        hotel.refresh_from_db()
+        self.assertEqual((hotel.city, hotel.country), ('Sofia', 'Bulgaria'))
+        self.assertEqual((hotel.latitude, hotel.longitude), (42.7, 23.3))
+
+
+class HotPathIndexTests(TestCase):
+    def test_explain_indexes_command(self):
+        """Test that plans are reported with and without the indexes, which survive the run"""
+        out = StringIO()
+        call_command(
+            'explain_indexes', '--hotels', '3', '--rooms-per-hotel', '2', '--current-database', stdout=out
+        )
+        output = out.getvalue()
+        self.assertIn('== booking-overlap ==', output)
+        self.assertIn('-- without hot-path indexes --', output)
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Booking._meta.db_table)
+        self.assertIn('hotels_booking_active_dates', constraints)
+
+
+class BookingArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Test',
+            last_name='Guest',
+            password='testpass123'
+        )
+        owner = User.objects.create_user(
+            email='owner@example.com',
+            first_name='Hotel',
+            last_name='Owner',
+            password='testpass123',
+            role='HOTEL'
+        )
+        hotel = Hotel.objects.create(user=owner, name='Archive Hotel', stars=3, address='1 Archive St')
+        self.room = Room.objects.create(
+            hotel=hotel,
+            price=100,
+            bed_count=2,
+            max_adults=2,
+            room_type=RoomType.DOUBLE
+        )
+        old_start = date.today() - timedelta(days=200)
+        self.old_completed = self.book(old_start, old_start + timedelta(days=2), 'completed')
+        self.old_cancelled = self.book(old_start, old_start + timedelta(days=3), 'cancelled')
+        self.old_confirmed = self.book(old_start, old_start + timedelta(days=2), 'confirmed')
+        recent_start = date.today() - timedelta(days=10)
+        self.recent_completed = self.book(recent_start, recent_start + timedelta(days=2), 'completed')
+
+    def book(self, start_date, end_date, booking_status):
+        return Booking.objects.create(
+            room=self.room,
+            user=self.user,
+            start_date=start_date,
+            end_date=end_date,
+            status=booking_status
+        )
+
+    def test_archives_old_finished_bookings(self):
+        """Test that only old completed and cancelled bookings are moved to the archive"""
+        call_command('archive_bookings', '--chunk-size', '1', stdout=StringIO())
+
+        remaining = set(Booking.objects.values_list('id', flat=True))
+        self.assertEqual(remaining, {self.old_confirmed.id, self.recent_completed.id})
+        archived = {row.booking_id: row for row in BookingArchive.objects.all()}
+        self.assertEqual(set(archived), {self.old_completed.id, self.old_cancelled.id})
+        self.assertEqual(archived[self.old_cancelled.id].status, 'cancelled')
+        self.assertEqual(archived[self.old_cancelled.id].total_price, 300)
+        self.assertEqual(archived[self.old_completed.id].room, self.room)
+
+    def test_dry_run_keeps_bookings(self):
+        """Test that a dry run only reports what would be archived"""
+        out = StringIO()
+        call_command('archive_bookings', '--dry-run', stdout=out)
+        self.assertIn('2 bookings would be archived', out.getvalue())
+        self.assertEqual(Booking.objects.count(), 4)
+        self.assertFalse(BookingArchive.objects.exists())
+
+    def test_archive_survives_room_deletion(self):
+        """Test that archived bookings outlive the room they were made for"""
+        call_command('archive_bookings', stdout=StringIO())
+        self.room.delete()
+        self.assertEqual(BookingArchive.objects.filter(room__isnull=True).count(), 2)
@@ -0,0 +1,137 @@
+"""
+Uploads of hotel and room images: batches pushed to storage concurrently
+and inserted with a single bulk_create, and presigned direct-to-S3 uploads
+that are registered once the client has sent the file.
+"""
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils.text import slugify
+from rest_framework.exceptions import ValidationError
+
+from .exceptions import DirectUploadUnavailable
+
+from .tasks import schedule_renditions
+from . import cache as search_cache
+
+# Shared by all requests so concurrent uploads stay bounded process-wide
+# and each worker thread reuses its storage connection.
+executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'MEDIA_UPLOAD_WORKERS', 8),
+    thread_name_prefix='media-upload',
+)
+
+
+# Content types accepted for direct uploads and the extension stored with them
+DIRECT_UPLOAD_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+}
+
+
+def clean_filename(filename):
+    """
+    Slugify the name of an uploaded file, keeping its extension.
+    """
+    name, ext = os.path.splitext(os.path.basename(filename))
+    return f"{slugify(name) or 'image'}{ext.lower()}"
+
+
+def unique_filename(filename):
+    """
+    Clean `filename` and add a random suffix. Batches are saved in
+    parallel, so the storage's own existence check can't tell apart files
+    that share a name (phones call every photo image.jpg).
+    """
+    name, ext = os.path.splitext(clean_filename(filename))
+    return f"{name}-{uuid.uuid4().hex[:12]}{ext}"
+
+
+def store_files(field, files):
+    """
+    Save `files` to the storage of file field `field` in parallel and
+    return their stored names in order. If any upload fails, the files
+    already stored are removed and the error is raised.
+    """
+    names = [field.generate_filename(None, unique_filename(file.name)) for file in files]
+    futures = [executor.submit(field.storage.save, name, file) for name, file in zip(names, files)]
+
+    stored, error = [], None
+    for future in futures:
+        try:
+            stored.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        for name in stored:
+            field.storage.delete(name)
+        raise error
+    return stored
+
+
+def bulk_create_images(model, files, **fields):
+    """
+    Upload `files` and create one `model` image row per file, with
+    `fields` (e.g. hotel=hotel) set on every row.
+    """
+    files = list(files)
+    if not files:
+        return []
+    names = store_files(model._meta.get_field('image'), files)
+    images = model.objects.bulk_create([model(image=name, **fields) for name in names])
+
+    # bulk_create sends no post_save signals
+    for image in images:
+        schedule_renditions(image)
+    search_cache.invalidate()
+    return images
+
+
+def direct_upload_prefix(model, owner):
+    """
+    Folder that direct uploads of `model` images for `owner` (the hotel or
+    room they belong to) are confined to.
+    """
+    return f"{model._meta.get_field('image').upload_to}{owner.pk}/"
+
+
+def issue_direct_upload(model, owner, content_type):
+    """
+    Reserve a unique key under the owner's folder and return the presigned
+    POST the client uploads it with.
+    """
+    storage = model._meta.get_field('image').storage
+    if not hasattr(storage, 'presigned_post'):
+        raise DirectUploadUnavailable()
+    if content_type not in DIRECT_UPLOAD_TYPES:
+        raise ValidationError({'content_type': f"Must be one of: {', '.join(DIRECT_UPLOAD_TYPES)}."})
+
+    key = f"{direct_upload_prefix(model, owner)}{uuid.uuid4().hex}{DIRECT_UPLOAD_TYPES[content_type]}"
+    upload = storage.presigned_post(key, content_type)
+    return {'key': key, 'url': upload['url'], 'fields': upload['fields']}
+
+
+def confirm_direct_upload(model, owner, key, **fields):
+    """
+    Register a directly uploaded `key` as a `model` image row after checking
+    it belongs to the owner's folder and is present in storage.
+    """
+    storage = model._meta.get_field('image').storage
+    if not hasattr(storage, 'presigned_post'):
+        raise DirectUploadUnavailable()
+    folder, _, filename = key.rpartition('/')
+    if (
+        f'{folder}/' != direct_upload_prefix(model, owner)
+        or os.path.splitext(filename)[1] not in DIRECT_UPLOAD_TYPES.values()
+    ):
+        raise ValidationError({'key': 'Invalid upload key.'})
+    if model.objects.filter(image=key).exists():
+        raise ValidationError({'key': 'This upload has already been registered.'})
+    if not storage.exists(key):
+        raise ValidationError({'key': 'No uploaded file was found for this key.'})
+
+    # Saved individually so the post_save signals queue renditions
+    return model.objects.create(image=key, **fields)
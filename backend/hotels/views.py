@@ -4,29 +4,144 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
-from .models import Hotel, Room, Booking, FavoriteHotel, Review
+from .models import Hotel, Room, Booking, FavoriteHotel, Review, RoomNight
 from .serializers import (
     HotelSerializer, 
+    HotelListSerializer,
     RoomSerializer, 
     BookingSerializer, 
     FavoriteHotelSerializer,
-    ReviewSerializer
+    ReviewSerializer,
+    ImageSerializer,
+    RoomImageSerializer,
+    FavoriteBulkSerializer
 )
 from rest_framework import viewsets, permissions
 from rest_framework import serializers
-from .models import RoomImage
+from .models import RoomImage, HotelImage
 from rest_framework.decorators import action
 from datetime import datetime
-from django.db import IntegrityError
-from .models import Feature
+from django.db import IntegrityError, transaction
+from .pagination import HotelCursorPagination, BookingCursorPagination
+from .exceptions import BookingConflict
+from . import cache as search_cache
+from . import search
+from .locations import within_radius, DEFAULT_RADIUS_KM
+from .uploads import bulk_create_images, issue_direct_upload, confirm_direct_upload
+from .availability import availability_calendar, calendar_etag, MAX_CALENDAR_DAYS
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.http import StreamingHttpResponse
+from .exports import EXPORT_FORMATS, export_rows, filter_bookings
+from .features import clean_feature_names, set_hotel_features
+from . import ranking
+
+def is_compact(request):
+    """
+    Whether the client asked for compact booking representations.
+    """
+    return request.query_params.get('compact', '').lower() in ('1', 'true')
+
 
 class HotelViewSet(viewsets.ReadOnlyModelViewSet):
     """
     A simple ViewSet for viewing hotels.
+    Listings are cursor-paginated and use a slim representation; the full
+    nested hotel is only returned by the detail route.
     """
     queryset = Hotel.objects.all()
     serializer_class = HotelSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = HotelCursorPagination
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return HotelListSerializer
+        return HotelSerializer
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """
+        Serve the response from the search cache, when it is enabled. Staff
+        users see unapproved hotels too, so their requests always bypass it.
+        """
+        if not search_cache.enabled() or getattr(request.user, 'is_staff', False):
+            return handler(request, *args, **kwargs)
+
+        key = search_cache.make_key(request, self.action, kwargs.get('pk'))
+        data = search_cache.get_response(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            search_cache.store_response(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[permissions.IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Hit and miss counters of the search response cache.
+        """
+        return Response(search_cache.stats())
+
+    @action(detail=True, methods=['get'])
+    def availability(self, request, pk=None):
+        """
+        Availability of every room of the hotel for each night between the
+        `from` and `to` dates. Responses carry an ETag so clients can
+        revalidate a calendar without downloading it again.
+        """
+        response = self.cached_response(self.availability_calendar, request, pk=pk)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        etag = calendar_etag(response.data)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def availability_calendar(self, request, pk=None):
+        start_date_str = request.query_params.get('from')
+        end_date_str = request.query_params.get('to')
+        if not start_date_str or not end_date_str:
+            return Response(
+                {"detail": "Both from and to are required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return Response(
+                {"detail": "Invalid date format. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if end_date <= start_date:
+            return Response(
+                {"detail": "'to' must be after 'from'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end_date - start_date).days > MAX_CALENDAR_DAYS:
+            return Response(
+                {"detail": f"The calendar can span at most {MAX_CALENDAR_DAYS} nights."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        hotel = self.get_object()
+        return Response(availability_calendar(hotel, start_date, end_date))
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -37,10 +152,18 @@ class HotelViewSet(viewsets.ReadOnlyModelViewSet):
         try:
             # Get all query parameters
             city = self.request.query_params.get('city')
+            q = self.request.query_params.get('q', '').strip()
+            city_exact = self.request.query_params.get('city_exact', '').strip()
+            country = self.request.query_params.get('country', '').strip()
+            lat_str = self.request.query_params.get('lat')
+            lon_str = self.request.query_params.get('lon')
+            radius_str = self.request.query_params.get('radius_km')
             beds_str = self.request.query_params.get('beds')
             adults_str = self.request.query_params.get('adults')
             check_in_str = self.request.query_params.get('check_in')
             check_out_str = self.request.query_params.get('check_out')
+            amenities = ','.join(self.request.query_params.getlist('amenities'))
+            ordering = self.request.query_params.get('ordering', '')
 
             # Start with all hotels
             queryset = Hotel.objects.all()
@@ -52,7 +175,28 @@ class HotelViewSet(viewsets.ReadOnlyModelViewSet):
 
             # Filter by city first (if provided)
             if city:
-                queryset = queryset.filter(address__icontains=city)
+                queryset = search.filter_city(queryset, city)
+
+            # Exact matches on the parsed location use the city/country indexes
+            if city_exact:
+                queryset = queryset.filter(city__iexact=city_exact)
+            if country:
+                queryset = queryset.filter(country__iexact=country)
+
+            # Free-text search over name, address, description and features
+            if q:
+                queryset = search.search(queryset, q)
+
+            # Hotels within radius_km (default 10) of lat/lon, nearest first
+            if lat_str and lon_str:
+                try:
+                    latitude, longitude = float(lat_str), float(lon_str)
+                    radius_km = float(radius_str) if radius_str else DEFAULT_RADIUS_KM
+                    if -90 <= latitude <= 90 and -180 <= longitude <= 180 and radius_km > 0:
+                        queryset = within_radius(queryset, latitude, longitude, radius_km)
+                except ValueError:
+                    # Ignore malformed coordinates
+                    pass
 
             # Only apply room-based filters if room search parameters are provided
             if any([beds_str, adults_str, check_in_str, check_out_str]):
@@ -73,10 +217,10 @@ class HotelViewSet(viewsets.ReadOnlyModelViewSet):
                         check_in_date = datetime.strptime(check_in_str, '%Y-%m-%d').date()
                         check_out_date = datetime.strptime(check_out_str, '%Y-%m-%d').date()
 
-                        # Find IDs of rooms that have conflicting bookings
-                        booked_room_ids = Booking.objects.filter(
-                            start_date__lt=check_out_date,
-                            end_date__gt=check_in_date
+                        # Find IDs of rooms already booked for any night of the stay
+                        booked_room_ids = RoomNight.objects.filter(
+                            night__gte=check_in_date,
+                            night__lt=check_out_date
                         ).values_list('room_id', flat=True)
 
                         # Exclude these booked rooms
@@ -91,6 +235,20 @@ class HotelViewSet(viewsets.ReadOnlyModelViewSet):
                 # Filter to only include hotels that have available rooms matching the criteria
                 queryset = queryset.filter(id__in=hotel_ids_with_available_rooms)
 
+            # Price, stars, score and distance ranges, and hotels having all amenities
+            queryset = ranking.filter_ranges(queryset, self.request.query_params)
+            if amenities:
+                queryset = ranking.filter_amenities(queryset, amenities)
+
+            # An explicit sort order replaces search rank and radius ordering
+            if ordering:
+                queryset = ranking.order_hotels(queryset, ordering)
+
+            if self.action == 'list':
+                queryset = queryset.prefetch_related('images')
+            elif self.action == 'retrieve':
+                queryset = queryset.with_details()
+
             return queryset.distinct()
         except Exception as e:
             print(f"Error in get_queryset: {str(e)}")  # Log the error
@@ -108,8 +266,9 @@ class MyHotelView(viewsets.ViewSet):
         Get the hotel associated with the current user.
         """
         try:
-            if hasattr(request.user, 'hotel'):
-                serializer = HotelSerializer(request.user.hotel, context={'request': request})
+            hotel = Hotel.objects.with_details().filter(user=request.user).first()
+            if hotel:
+                serializer = HotelSerializer(hotel, context={'request': request})
                 return Response(serializer.data, status=status.HTTP_200_OK)
             return Response(
                 {"error": "No hotel found for this user."},
@@ -141,22 +300,7 @@ class MyHotelView(viewsets.ViewSet):
                 features_input = request.data.get('features')
                 if features_input is not None:
                     try:
-                        if isinstance(features_input, list):
-                            feature_names = [str(name).strip() for name in features_input if str(name).strip()]
-                        else:
-                            feature_names = [name.strip() for name in str(features_input).split(',') if name.strip()]
-
-                        non_amenity_features = []
-                        for name in feature_names:
-                            feature_obj, _ = Feature.objects.get_or_create(
-                                name=name,
-                                defaults={'is_amenity': False}
-                            )
-                            non_amenity_features.append(feature_obj)
-
-                        existing_amenities = hotel.features.filter(is_amenity=True)
-                        combined_features = list(existing_amenities) + non_amenity_features
-                        hotel.features.set(combined_features)
+                        set_hotel_features(hotel, clean_feature_names(features_input))
                     except Exception as e:
                         return Response(
                             {"error": f"Failed to update features: {str(e)}"},
@@ -166,21 +310,20 @@ class MyHotelView(viewsets.ViewSet):
                 # Handle image uploads
                 images_data = request.FILES.getlist('images')
                 if images_data:
-                    from .models import HotelImage
                     import logging
                     logger = logging.getLogger(__name__)
                     
-                    for image_data in images_data:
-                        try:
-                            hotel_image = HotelImage.objects.create(hotel=hotel, image=image_data)
-                            logger.info(f"Successfully created hotel image: {hotel_image.image.url}")
-                        except Exception as e:
-                            logger.error(f"Failed to save hotel image: {str(e)}")
-                            return Response(
-                                {"error": f"Failed to save image: {str(e)}"},
-                                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                            )
+                    try:
+                        hotel_images = bulk_create_images(HotelImage, images_data, hotel=hotel)
+                        logger.info(f"Successfully created {len(hotel_images)} hotel images")
+                    except Exception as e:
+                        logger.error(f"Failed to save hotel images: {str(e)}")
+                        return Response(
+                            {"error": f"Failed to save image: {str(e)}"},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
                 # Re-serialize to reflect updated features/images
+                hotel = Hotel.objects.with_details().get(pk=hotel.pk)
                 refreshed = HotelSerializer(hotel, context={'request': request})
                 return Response(refreshed.data, status=status.HTTP_200_OK)
             else:
@@ -195,27 +338,75 @@ class MyHotelView(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def bookings(self, request):
         """
-        Get all bookings for the hotel.
+        Get the hotel's bookings a page at a time, optionally filtered by
+        status and date range.
         """
-        try:
-            if not hasattr(request.user, 'hotel'):
-                return Response(
-                    {"error": "No hotel found for this user."},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-            
-            # Get all rooms for this hotel
-            rooms = request.user.hotel.rooms.all()
-            # Get all bookings for these rooms
-            bookings = Booking.objects.filter(room__in=rooms).order_by('-start_date')
-            serializer = BookingSerializer(bookings, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Exception as e:
+        if not hasattr(request.user, 'hotel'):
             return Response(
-                {"error": f"An unexpected error occurred: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "No hotel found for this user."},
+                status=status.HTTP_404_NOT_FOUND,
             )
 
+        bookings = filter_bookings(
+            Booking.objects.with_details(room_images=not is_compact(request)).filter(room__hotel=request.user.hotel),
+            request.query_params,
+        )
+        paginator = BookingCursorPagination()
+        page = paginator.paginate_queryset(bookings, request, view=self)
+        serializer = BookingSerializer(
+            page, many=True, context={'request': request, 'compact': is_compact(request)}
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path=r'bookings/export/(?P<export_format>csv|ndjson)')
+    def export_bookings(self, request, export_format=None):
+        """
+        Stream the hotel's bookings as CSV or NDJSON, with the same filters
+        as the bookings listing.
+        """
+        if not hasattr(request.user, 'hotel'):
+            return Response(
+                {"error": "No hotel found for this user."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        bookings = filter_bookings(
+            Booking.objects.filter(room__hotel=request.user.hotel),
+            request.query_params,
+        ).order_by('-start_date', '-id')
+        content_type, stream = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(export_rows(bookings)), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="bookings.{export_format}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def presign_upload(self, request):
+        """
+        Issue a presigned POST for uploading a hotel image straight to S3.
+        """
+        if not hasattr(request.user, 'hotel'):
+            return Response(
+                {"error": "No hotel found for this user."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        upload = issue_direct_upload(HotelImage, request.user.hotel, request.data.get('content_type'))
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='uploads/confirm')
+    def confirm_upload(self, request):
+        """
+        Register a presigned upload as an image of the user's hotel.
+        """
+        if not hasattr(request.user, 'hotel'):
+            return Response(
+                {"error": "No hotel found for this user."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        hotel = request.user.hotel
+        image = confirm_direct_upload(HotelImage, hotel, str(request.data.get('key', '')), hotel=hotel)
+        return Response(ImageSerializer(image, context={'request': request}).data, status=status.HTTP_201_CREATED)
+
+
 class BookingViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows bookings to be viewed or edited.
@@ -225,17 +416,21 @@ class BookingViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Booking.objects.all()
+        queryset = Booking.objects.with_details(room_images=not is_compact(self.request))
         user = getattr(self.request, 'user', None)
         if user and getattr(user, 'is_authenticated', False):
             if hasattr(user, 'hotel'):
                 # If user is a hotel owner, return bookings for their hotel
-                rooms = user.hotel.rooms.all()
-                return queryset.filter(room__in=rooms)
+                return queryset.filter(room__hotel=user.hotel)
             # If user is a regular user, return their bookings
             return queryset.filter(user=user)
         return Booking.objects.none()
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['compact'] = is_compact(self.request)
+        return context
+
     def perform_create(self, serializer):
         # Prevent hotel users from creating bookings
         if hasattr(self.request.user, 'hotel'):
@@ -262,12 +457,13 @@ class BookingViewSet(viewsets.ModelViewSet):
                 "detail": "End date cannot be in the past."
             })
 
-        if not room.is_available(start_date, end_date):
-            raise serializers.ValidationError({
-                "detail": "This room is not available for the selected dates."
-            })
-            
-        serializer.save(user=self.request.user, status='pending')
+        with transaction.atomic():
+            # Lock the room row so concurrent bookings of the same room are
+            # checked and inserted one at a time instead of racing
+            Room.objects.select_for_update().get(pk=room.pk)
+            if not room.is_available(start_date, end_date):
+                raise BookingConflict()
+            serializer.save(user=self.request.user, status='pending')
 
     def partial_update(self, request, *args, **kwargs):
         booking = self.get_object()
@@ -293,7 +489,18 @@ class BookingViewSet(viewsets.ModelViewSet):
                 {"error": f"Status must be one of: {', '.join(valid_statuses)}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
+
+        # Reactivating a cancelled or completed booking takes the room again
+        if (
+            booking.status not in Booking.ACTIVE_STATUSES
+            and request.data['status'] in Booking.ACTIVE_STATUSES
+        ):
+            with transaction.atomic():
+                Room.objects.select_for_update().get(pk=booking.room_id)
+                if not booking.room.is_available(booking.start_date, booking.end_date, booking_id=booking.id):
+                    raise BookingConflict()
+                return super().partial_update(request, *args, **kwargs)
+
         return super().partial_update(request, *args, **kwargs)
 
     @action(detail=True, methods=['post'])
@@ -320,16 +527,17 @@ class BookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if not booking.room.is_available(start_date, end_date, booking_id=booking.id):
-            return Response(
-                {"detail": "This room is not available for the selected dates."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        with transaction.atomic():
+            Room.objects.select_for_update().get(pk=booking.room_id)
+            if not booking.room.is_available(start_date, end_date, booking_id=booking.id):
+                raise BookingConflict()
 
-        booking.start_date = start_date
-        booking.end_date = end_date
-        booking.save()
-        return Response(BookingSerializer(booking).data)
+            booking.start_date = start_date
+            booking.end_date = end_date
+            booking.save()
+        # Reload so the total price reflects the new dates
+        booking = self.get_queryset().get(pk=booking.pk)
+        return Response(self.get_serializer(booking).data)
 
     def perform_destroy(self, instance):
         """
@@ -353,7 +561,12 @@ class RoomViewSet(viewsets.ModelViewSet):
         """
         user = getattr(self.request, 'user', None)
         if user and hasattr(user, 'hotel'):
-            return Room.objects.filter(hotel=user.hotel)
+            return (
+                Room.objects
+                .filter(hotel=user.hotel)
+                .select_related('hotel')
+                .prefetch_related('images')
+            )
         return Room.objects.none()
 
     def perform_create(self, serializer):
@@ -362,9 +575,7 @@ class RoomViewSet(viewsets.ModelViewSet):
         """
         if hasattr(self.request.user, 'hotel'):
             room = serializer.save(hotel=self.request.user.hotel)
-            images_data = self.request.FILES.getlist('images')
-            for image_data in images_data:
-                RoomImage.objects.create(room=room, image=image_data)
+            bulk_create_images(RoomImage, self.request.FILES.getlist('images'), room=room)
         else:
             raise serializers.ValidationError("You are not associated with a hotel.")
 
@@ -377,9 +588,7 @@ class RoomViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
-        images_data = self.request.FILES.getlist('images')
-        for image_data in images_data:
-            RoomImage.objects.create(room=room, image=image_data)
+        bulk_create_images(RoomImage, self.request.FILES.getlist('images'), room=room)
 
         return Response(serializer.data)
 
@@ -398,8 +607,43 @@ class RoomViewSet(viewsets.ModelViewSet):
                 {"error": "Image not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+    @action(detail=True, methods=['post'], url_path='uploads')
+    def presign_upload(self, request, pk=None):
+        """
+        Issue a presigned POST for uploading a room image straight to S3.
+        """
+        room = self.get_object()
+        upload = issue_direct_upload(RoomImage, room, request.data.get('content_type'))
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'], url_path='uploads/confirm')
+    def confirm_upload(self, request, pk=None):
+        """
+        Register a presigned upload as an image of this room.
+        """
+        room = self.get_object()
+        image = confirm_direct_upload(RoomImage, room, str(request.data.get('key', '')), room=room)
+        return Response(RoomImageSerializer(image, context={'request': request}).data, status=status.HTTP_201_CREATED)
             
 
+MAX_FAVORITE_STATUS_IDS = 200
+
+
+def favorite_status(user, hotel_ids):
+    """
+    Map each hotel id to whether it is one of the user's favorites.
+    """
+    if not hotel_ids:
+        return {}
+    favorited = set(
+        FavoriteHotel.objects
+        .filter(user=user, hotel_id__in=hotel_ids)
+        .values_list('hotel_id', flat=True)
+    )
+    return {str(hotel_id): hotel_id in favorited for hotel_id in sorted(hotel_ids)}
+
+
 class FavoriteHotelViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows users to view and manage their favorite hotels.
@@ -413,7 +657,58 @@ class FavoriteHotelViewSet(viewsets.ModelViewSet):
         This view should return a list of all the favorite hotels
         for the currently authenticated user.
         """
-        return self.queryset.filter(user=self.request.user)
+        return (
+            self.queryset
+            .filter(user=self.request.user)
+            .select_related('hotel')
+            .prefetch_related('hotel__images')
+            .order_by('-created_at', '-id')
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Add and remove several favorites at once. Unknown hotel ids are
+        ignored; the response maps every requested id to whether it is now
+        a favorite.
+        """
+        serializer = FavoriteBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        add_ids = set(serializer.validated_data['add'])
+        remove_ids = set(serializer.validated_data['remove'])
+
+        with transaction.atomic():
+            if remove_ids:
+                FavoriteHotel.objects.filter(user=request.user, hotel_id__in=remove_ids).delete()
+            if add_ids:
+                FavoriteHotel.objects.bulk_create(
+                    [
+                        FavoriteHotel(user=request.user, hotel_id=hotel_id)
+                        for hotel_id in Hotel.objects.filter(id__in=add_ids).values_list('id', flat=True)
+                    ],
+                    ignore_conflicts=True,
+                )
+        return Response(favorite_status(request.user, add_ids | remove_ids))
+
+    @action(detail=False, methods=['get'], url_path='status', url_name='status')
+    def statuses(self, request):
+        """
+        Whether each hotel in the comma-separated `ids` is a favorite of
+        the user, without loading the favorites list.
+        """
+        try:
+            hotel_ids = {int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()}
+        except ValueError:
+            return Response(
+                {"detail": "ids must be a comma-separated list of hotel ids."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(hotel_ids) > MAX_FAVORITE_STATUS_IDS:
+            return Response(
+                {"detail": f"At most {MAX_FAVORITE_STATUS_IDS} ids can be checked at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(favorite_status(request.user, hotel_ids))
 
     def create(self, request, *args, **kwargs):
         """
@@ -471,7 +766,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
-        queryset = Review.objects.all()
+        queryset = Review.objects.select_related('user')
         hotel_id = self.request.query_params.get('hotel_id')
         if hotel_id:
             queryset = queryset.filter(hotel_id=hotel_id)
@@ -1,11 +1,12 @@
 import { MapPin, Star, DollarSign, Heart, ChevronRight } from "lucide-react";
 import { Link } from "react-router-dom";
 import { Hotel } from "../../types/api";
-import { useFavorites, useToggleFavorite } from "../../hooks/useApi";
+import { useToggleFavorite } from "../../hooks/useApi";
 
 interface SearchResultsProps {
   hotel: Hotel;
   nights: number;
+  isFavorited: boolean;
 }
 
 const renderStars = (rating: number) => {
@@ -27,16 +28,14 @@ const HotelImage = ({
   hotelName,
   photoUrl,
   hotelId,
+  isFavorited,
 }: {
   hotelName: string;
   photoUrl: string | null;
   hotelId: string;
+  isFavorited: boolean;
 }) => {
-  const { data: favoritesData } = useFavorites();
   const toggleFavorite = useToggleFavorite();
-  const favorites = favoritesData || [];
-  const isFavorited = favorites.some((fav: any) => fav.hotel.id === hotelId);
-  const favoriteId = favorites.find((fav: any) => fav.hotel.id === hotelId)?.id;
 
   return (
     <div className="relative h-56 w-full overflow-hidden">
@@ -56,7 +55,7 @@ const HotelImage = ({
         onClick={(e) => {
           e.preventDefault();
           e.stopPropagation();
-          toggleFavorite(hotelId, isFavorited, favoriteId);
+          toggleFavorite(hotelId, isFavorited);
         }}
       >
         <Heart
@@ -69,7 +68,7 @@ const HotelImage = ({
   );
 };
 
-const SearchResults = ({ hotel, nights }: SearchResultsProps) => {
+const SearchResults = ({ hotel, nights, isFavorited }: SearchResultsProps) => {
   return (
     <div className="bg-white rounded-xl shadow-lg overflow-hidden transition-all duration-300 hover:shadow-2xl group">
       <Link to={`/hotel/${hotel.id}`} className="block">
@@ -77,6 +76,7 @@ const SearchResults = ({ hotel, nights }: SearchResultsProps) => {
           hotelName={hotel.name}
           photoUrl={hotel.photo_url}
           hotelId={hotel.id}
+          isFavorited={isFavorited}
         />
         <div className="p-6">
           <div className="flex justify-between items-start mb-2">
@@ -1,5 +1,10 @@
 import React from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+  useInfiniteQuery,
+  useQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query";
 import api, { BACKEND_URL } from "../config/api";
 import axios from "axios";
 import { useNavigate } from "react-router-dom";
@@ -69,8 +74,23 @@ export function useFeaturedHotels() {
     queryKey: ["featuredHotels"],
     queryFn: async () => {
       const response = await api.get("/hotels/search/");
+      return response.data.results;
+    },
+  });
+}
+
+export function useHotelSearch(params: Record<string, string | number>) {
+  return useInfiniteQuery({
+    queryKey: ["hotelSearch", params],
+    queryFn: async ({ pageParam }) => {
+      // The next-page link already carries the search filters
+      const response = pageParam
+        ? await api.get(pageParam)
+        : await api.get("/hotels/search/", { params });
       return response.data;
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next ?? null,
   });
 }
 
@@ -194,11 +214,44 @@ export function useHotelDetails(hotelId: string) {
   });
 }
 
+export interface RoomAvailability {
+  id: number;
+  room_type: string;
+  available: boolean[];
+}
+
+export interface HotelAvailability {
+  hotel: number;
+  from: string;
+  to: string;
+  nights: string[];
+  rooms: RoomAvailability[];
+}
+
+export function useHotelAvailability(
+  hotelId: string,
+  from: string,
+  to: string
+) {
+  return useQuery<HotelAvailability>({
+    queryKey: ["hotelAvailability", hotelId, from, to],
+    queryFn: () =>
+      api
+        .get(`/hotels/search/${hotelId}/availability/`, {
+          params: { from, to },
+        })
+        .then((res) => res.data),
+    enabled: !!hotelId && !!from && !!to,
+  });
+}
+
 export function useUserBookings() {
   return useQuery({
     queryKey: ["userBookings"],
     queryFn: async () => {
-      const hotelBookingsResponse = await api.get("/hotels/bookings/");
+      const hotelBookingsResponse = await api.get("/hotels/bookings/", {
+        params: { compact: 1 },
+      });
       const hotelBookings = hotelBookingsResponse.data.map((booking: any) => ({
         ...booking,
         type: "hotel",
@@ -269,57 +322,54 @@ export function useFavorites() {
   });
 }
 
+export function useFavoriteStatus(hotelIds: (string | number)[]) {
+  const ids = hotelIds.map(String).sort();
+  return useQuery<Record<string, boolean>>({
+    queryKey: ["favoriteStatus", ids],
+    queryFn: async () => {
+      const response = await api.get("/hotels/favorites/status/", {
+        params: { ids: ids.join(",") },
+      });
+      return response.data;
+    },
+    enabled: !!localStorage.getItem("accessToken") && ids.length > 0,
+  });
+}
+
 export function useToggleFavorite() {
   const queryClient = useQueryClient();
 
-  const createMutation = useMutation({
-    mutationFn: async (hotelId: string) => {
+  const bulkMutation = useMutation({
+    mutationFn: async ({
+      hotelId,
+      isFavorited,
+    }: {
+      hotelId: string;
+      isFavorited: boolean;
+    }) => {
       try {
-        const response = await api.post("/hotels/favorites/", {
-          hotel: hotelId,
+        const response = await api.post("/hotels/favorites/bulk/", {
+          [isFavorited ? "remove" : "add"]: [Number(hotelId)],
         });
         return response.data;
       } catch (error: any) {
         throw new Error(
           error.response?.data?.detail ||
             error.response?.data?.error ||
-            "Failed to add to favorites"
-        );
-      }
-    },
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ["favoriteHotels"] });
-    },
-  });
-
-  const deleteMutation = useMutation({
-    mutationFn: async (favoriteId: string) => {
-      try {
-        const response = await api.delete(`/hotels/favorites/${favoriteId}/`);
-        return response.data;
-      } catch (error: any) {
-        throw new Error(
-          error.response?.data?.detail ||
-            error.response?.data?.error ||
-            "Failed to remove from favorites"
+            (isFavorited
+              ? "Failed to remove from favorites"
+              : "Failed to add to favorites")
         );
       }
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["favoriteHotels"] });
+      queryClient.invalidateQueries({ queryKey: ["favoriteStatus"] });
     },
   });
 
-  return async (hotelId: string, isFavorited: boolean, favoriteId?: string) => {
-    try {
-      if (isFavorited && favoriteId) {
-        await deleteMutation.mutateAsync(favoriteId);
-      } else {
-        await createMutation.mutateAsync(hotelId);
-      }
-    } catch (error) {
-      throw error;
-    }
+  return async (hotelId: string, isFavorited: boolean) => {
+    await bulkMutation.mutateAsync({ hotelId, isFavorited });
   };
 }
 
@@ -405,12 +455,19 @@ export function useSubmitReview() {
 }
 
 export function useHotelBookings() {
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: ["hotelBookings"],
-    queryFn: async () => {
-      const response = await api.get("/hotels/my-hotel/bookings/");
+    queryFn: async ({ pageParam }) => {
+      // The next-page link already carries the compact flag
+      const response = pageParam
+        ? await api.get(pageParam)
+        : await api.get("/hotels/my-hotel/bookings/", {
+            params: { compact: 1 },
+          });
       return response.data;
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next ?? null,
     enabled: !!localStorage.getItem("accessToken"),
   });
 }
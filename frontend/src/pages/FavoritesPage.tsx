@@ -11,9 +11,9 @@ const FavoritesPage: React.FC = () => {
   const { data: favorites, isLoading } = useFavorites();
   const toggleFavorite = useToggleFavorite();
 
-  const handleUnfavorite = async (hotelId: string, favoriteId: string) => {
+  const handleUnfavorite = async (hotelId: string) => {
     try {
-      await toggleFavorite(hotelId, true, favoriteId);
+      await toggleFavorite(hotelId, true);
     } catch (error) {
       console.error("Failed to remove from favorites:", error);
     }
@@ -49,14 +49,12 @@ const FavoritesPage: React.FC = () => {
               >
                 <div className="relative h-48">
                   <img
-                    src={
-                      fav.hotel.images?.[0]?.image || "/placeholder-hotel.jpg"
-                    }
+                    src={fav.hotel.photo_url || "/placeholder-hotel.jpg"}
                     alt={fav.hotel.name}
                     className="w-full h-full object-cover"
                   />
                   <button
-                    onClick={() => handleUnfavorite(fav.hotel.id, fav.id)}
+                    onClick={() => handleUnfavorite(fav.hotel.id)}
                     className="absolute top-4 right-4 p-2 rounded-full hover:bg-black/10 transition-colors group"
                     title="Remove from wishlist"
                   >
@@ -83,7 +81,7 @@ const FavoritesPage: React.FC = () => {
                       starClassName="h-4 w-4"
                     />
                     <span className="ml-2 text-sm text-gray-600">
-                      ({fav.hotel.reviews?.length || 0} reviews)
+                      ({fav.hotel.review_count || 0} reviews)
                     </span>
                   </div>
                   <Link to={`/hotel/search/${fav.hotel.id}`}>
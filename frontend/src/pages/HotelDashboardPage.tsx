@@ -83,7 +83,14 @@ const BookingStatusBadge: React.FC<{
 
 const HotelDashboardPage: React.FC = () => {
   const { data: hotel, isLoading, error, refetch } = useMyHotel();
-  const { data: bookings, isLoading: bookingsLoading } = useHotelBookings();
+  const {
+    data: bookingPages,
+    isLoading: bookingsLoading,
+    hasNextPage: hasMoreBookings,
+    fetchNextPage: fetchMoreBookings,
+    isFetchingNextPage: fetchingMoreBookings,
+  } = useHotelBookings();
+  const bookings = bookingPages?.pages.flatMap((page) => page.results);
   const updateBookingStatus = useUpdateBookingStatus();
   const [selectedImage, setSelectedImage] = useState<string | null>(null);
   const [showAddRoomForm, setShowAddRoomForm] = useState(false);
@@ -382,6 +389,17 @@ const HotelDashboardPage: React.FC = () => {
                       </div>
                     </div>
                   ))}
+                  {hasMoreBookings && (
+                    <div className="flex justify-center">
+                      <Button
+                        size="sm"
+                        onClick={() => fetchMoreBookings()}
+                        disabled={fetchingMoreBookings}
+                      >
+                        {fetchingMoreBookings ? "Loading..." : "Load more"}
+                      </Button>
+                    </div>
+                  )}
                 </div>
               )}
             </InfoCard>
@@ -22,7 +22,7 @@ import {
 } from "lucide-react";
 import { Link } from "react-router-dom";
 import {
-  useFavorites,
+  useFavoriteStatus,
   useToggleFavorite,
   useHotelDetails,
   useCurrentUser,
@@ -49,23 +49,19 @@ const HotelDetailsPage = () => {
   const { data: user } = useCurrentUser();
   const { data: hotel, isLoading, error } = useHotelDetails(hotelId || "");
   const [showAllPhotos, setShowAllPhotos] = useState(false);
-  const { data: favoritesData, isLoading: favoritesLoading } = useFavorites();
+  const { data: favoriteStatus, isLoading: favoritesLoading } =
+    useFavoriteStatus(hotelId ? [hotelId] : []);
   const [isSaving, setIsSaving] = useState(false);
   const toggleFavorite = useToggleFavorite();
 
-  // Find the favorite entry for this hotel
-  const favoriteEntry = favoritesData?.find(
-    (fav: any) => fav.hotel.id === Number(hotelId)
-  );
-  const isFavorited = !!favoriteEntry;
-  const favoriteId = favoriteEntry?.id;
+  const isFavorited = !!(hotelId && favoriteStatus?.[hotelId]);
 
   const handleSave = async () => {
     if (!hotelId || isSaving) return;
 
     try {
       setIsSaving(true);
-      await toggleFavorite(hotelId, isFavorited, favoriteId);
+      await toggleFavorite(hotelId, isFavorited);
     } catch (error) {
       console.error("Failed to toggle favorite:", error);
     } finally {
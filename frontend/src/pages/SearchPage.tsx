@@ -1,10 +1,11 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useMemo } from "react";
 import { useLocation, useNavigate } from "react-router-dom";
-import api from "../config/api";
 import { Hotel } from "../types/api";
 import HotelSearch from "../components/features/HotelSearch";
 import HotelCardSkeleton from "../components/features/HotelCardSkeleton";
 import SearchResults from "../components/features/SearchResults";
+import Button from "../components/ui/Button";
+import { useFavoriteStatus, useHotelSearch } from "../hooks/useApi";
 
 const SearchPage: React.FC = () => {
   const location = useLocation();
@@ -18,61 +19,53 @@ const SearchPage: React.FC = () => {
     beds: 1,
     currency: "USD",
   });
-  const [hotels, setHotels] = useState<Hotel[]>([]);
-  const [isLoading, setIsLoading] = useState(false);
-  const [error, setError] = useState<string | null>(null);
-  const [hasSearched, setHasSearched] = useState(false);
 
-  const fetchHotels = async (params = {}) => {
-    console.log("🔍 fetchHotels called with params:", params);
-    setIsLoading(true);
-    setError(null);
-
-    try {
-      const response = await api.get("hotels/search/", { params });
-      console.log("✅ API response:", response.data);
-      setHotels(response.data);
-    } catch (err: any) {
-      console.error("❌ API error:", err);
-      setError(
-        err.response?.data?.error || "Failed to fetch hotels. Please try again."
-      );
-    } finally {
-      setIsLoading(false);
-      setHasSearched(true);
-    }
-  };
-
-  // Initial load - fetch all hotels
-  useEffect(() => {
+  // Without a search in the URL, list all hotels
+  const apiParams = useMemo(() => {
     if (!location.search) {
-      fetchHotels();
+      return {};
     }
-  }, []);
-
-  // Handle search params changes
-  useEffect(() => {
     const params = new URLSearchParams(location.search);
-    const city = params.get("destination") || "";
-    const checkIn = params.get("checkIn") || "";
-    const checkOut = params.get("checkOut") || "";
-    const adults = parseInt(params.get("adults") || "1", 10);
-    const beds = parseInt(params.get("beds") || "1", 10);
-    const currency = params.get("currency") || "USD";
+    return {
+      city: params.get("destination") || "",
+      check_in: params.get("checkIn") || "",
+      check_out: params.get("checkOut") || "",
+      adults: parseInt(params.get("adults") || "1", 10),
+      beds: parseInt(params.get("beds") || "1", 10),
+    };
+  }, [location.search]);
 
-    setSearchParams({ city, checkIn, checkOut, adults, beds, currency });
+  const {
+    data: hotelPages,
+    isLoading,
+    error: searchError,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+  } = useHotelSearch(apiParams);
+  const hotels: Hotel[] = useMemo(
+    () => hotelPages?.pages.flatMap((page) => page.results) ?? [],
+    [hotelPages]
+  );
+  const { data: favoriteStatus } = useFavoriteStatus(
+    hotels.map((hotel) => hotel.id)
+  );
+  const error = searchError
+    ? (searchError as any).response?.data?.error ||
+      "Failed to fetch hotels. Please try again."
+    : null;
 
-    if (location.search) {
-      const apiParams = {
-        city,
-        check_in: checkIn,
-        check_out: checkOut,
-        adults,
-        beds,
-      };
-      console.log("🚀 About to search with params:", apiParams);
-      fetchHotels(apiParams);
-    }
+  // Keep the search form in sync with the URL
+  useEffect(() => {
+    const params = new URLSearchParams(location.search);
+    setSearchParams({
+      city: params.get("destination") || "",
+      checkIn: params.get("checkIn") || "",
+      checkOut: params.get("checkOut") || "",
+      adults: parseInt(params.get("adults") || "1", 10),
+      beds: parseInt(params.get("beds") || "1", 10),
+      currency: params.get("currency") || "USD",
+    });
   }, [location.search]);
 
   const handleSearchParamChange = (
@@ -149,9 +142,20 @@ const SearchPage: React.FC = () => {
                       key={hotel.id}
                       hotel={hotel}
                       nights={nights}
+                      isFavorited={!!favoriteStatus?.[hotel.id]}
                     />
                   ))}
                 </div>
+                {hasNextPage && (
+                  <div className="flex justify-center mt-8">
+                    <Button
+                      onClick={() => fetchNextPage()}
+                      disabled={isFetchingNextPage}
+                    >
+                      {isFetchingNextPage ? "Loading..." : "Load more"}
+                    </Button>
+                  </div>
+                )}
               </>
             ) : (
               <div className="text-center text-gray-500 py-16">
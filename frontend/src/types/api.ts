@@ -97,6 +97,7 @@ export interface Hotel {
   photo_url: string | null;
   address: string;
   guest_score: number;
+  review_count?: number;
   distance_to_center: number;
   amenities: string[];
   description?: string;